@@ -5,21 +5,36 @@ import requests
 import logging
 from typing import Dict, Any, Optional, Tuple
 
+from http_session import activer_reprises, creer_session
+from rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Domaines de grandes chaînes/groups problématiques
+_DOMAINES_EXCLUS_APOLLO = (
+    "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
+    "airbnb.com", "trivago.com", "hotels.com"
+)
+
 
 class ApolloClient:
     """Client pour interroger l'API Apollo.io."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, requetes_par_minute: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialise le client Apollo.io.
         
         Args:
             api_key: Clé API Apollo.io
+            requetes_par_minute: Quota de requêtes par minute (None = pas de limite)
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.api_key = api_key
+        self.session = session or creer_session()
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
         self.base_url = "https://api.apollo.io/v1"
+        activer_reprises(self.session, self.base_url)
         self.headers = {
             "Cache-Control": "no-cache",
             "Content-Type": "application/json"
@@ -92,11 +107,7 @@ class ApolloClient:
                     return None
                 
                 # Ignorer les domaines de grandes chaînes/groups problématiques
-                domaines_exclus_apollo = [
-                    "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
-                    "airbnb.com", "trivago.com", "hotels.com"
-                ]
-                if any(exclu in domaine_lower for exclu in domaines_exclus_apollo):
+                if any(exclu in domaine_lower for exclu in _DOMAINES_EXCLUS_APOLLO):
                     logger.debug(f"Domaine grande chaîne détecté, skip Apollo: {domaine}")
                     return None
                 
@@ -106,7 +117,9 @@ class ApolloClient:
                 query_params["q_organization_locations"] = ville
             
             try:
-                response = requests.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
             except requests.exceptions.Timeout:
                 logger.debug(f"⏱️  Timeout Apollo.io pour {nom_entreprise}")
                 return None
@@ -194,7 +207,9 @@ class ApolloClient:
                 }
                 
                 try:
-                    response = requests.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
+                    if self._limiteur:
+                        self._limiteur.attendre()
+                    response = self.session.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
                     response.raise_for_status()
                     data = response.json()
                 except requests.exceptions.Timeout:
@@ -252,7 +267,9 @@ class ApolloClient:
             }
             
             try:
-                response = requests.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.post(url, json=query_params, headers=self.headers, timeout=(10, 30))
                 response.raise_for_status()
                 data = response.json()
             except requests.exceptions.Timeout:
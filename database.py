@@ -2,11 +2,13 @@
 Module de gestion de la base de données SQLite pour stocker les prospects.
 """
 import os
+import json
+import time
 import sqlite3
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Set
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +42,6 @@ def get_database_path() -> str:
     db_path = os.getenv("DB_PATH", str(base_dir / "prospects.db"))
     
     # Logger pour debug
-    import logging
-    logger = logging.getLogger(__name__)
     logger.info(f"📁 Chemin base de données déterminé: {db_path} (répertoire: {base_dir})")
     
     return db_path
@@ -65,6 +65,20 @@ class ProspectDatabase:
         logger.info(f"📁 Base de données utilisée: {self.db_path}")
         self._init_database()
     
+    def _connecter(self) -> sqlite3.Connection:
+        """
+        Ouvre une connexion à la base.
+        
+        En mode WAL, synchronous=NORMAL ne synchronise le disque qu'aux checkpoints et non à
+        chaque commit : un ajout de prospect ne coûte plus un fsync.
+        
+        Returns:
+            Connexion SQLite
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
     def _init_database(self):
         """Initialise la structure de la base de données."""
         try:
@@ -75,9 +89,13 @@ class ProspectDatabase:
             # Vérifier si la base existe déjà
             db_exists = os.path.exists(self.db_path)
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connecter()
             cursor = conn.cursor()
             
+            # Journal WAL (persistant dans le fichier) : les lectures de l'interface web et des
+            # exports ne bloquent plus les écritures des workers
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS prospects (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -141,6 +159,21 @@ class ProspectDatabase:
             except sqlite3.OperationalError:
                 pass  # La colonne existe déjà
             
+            # Recherche des doublons par site web (le nom est déjà couvert par la contrainte UNIQUE)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_prospects_site_web ON prospects(site_web)")
+            
+            # Cache des réponses des APIs externes (Apollo, Hunter, Google Maps, ZeroBounce, Serper)
+            # pour ne pas repayer les mêmes recherches d'une exécution à l'autre
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    source TEXT NOT NULL,
+                    cle TEXT NOT NULL,
+                    valeur TEXT,
+                    expire_le REAL NOT NULL,
+                    PRIMARY KEY (source, cle)
+                )
+            """)
+            
             conn.commit()
             conn.close()
             
@@ -164,7 +197,7 @@ class ProspectDatabase:
             ID du prospect ajouté ou None en cas d'erreur
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connecter()
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -225,7 +258,7 @@ class ProspectDatabase:
             True si le prospect existe, False sinon
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connecter()
             cursor = conn.cursor()
             
             if site_web:
@@ -248,6 +281,80 @@ class ProspectDatabase:
             logger.error(f"Erreur lors de la vérification du prospect: {e}")
             return False
     
+    def prospects_existent(self, cles: List[Tuple[str, Optional[str]]]) -> Set[Tuple[str, Optional[str]]]:
+        """
+        Vérifie en une seule requête quels prospects existent déjà dans la base.
+        
+        Même règle que prospect_existe : un prospect existe si son nom ou son site web est déjà enregistré.
+        
+        Args:
+            cles: Liste de tuples (nom_entreprise, site_web)
+        
+        Returns:
+            Ensemble des tuples (nom_entreprise, site_web) déjà présents
+        """
+        if not cles:
+            return set()
+        
+        try:
+            conn = self._connecter()
+            cursor = conn.cursor()
+            
+            noms_trouves = set()
+            sites_trouves = set()
+            # Découper pour rester sous la limite de paramètres SQLite
+            for debut in range(0, len(cles), 400):
+                lot = cles[debut:debut + 400]
+                noms = [nom for nom, _ in lot]
+                sites = [site_web for _, site_web in lot if site_web] or [None]
+                cursor.execute(f"""
+                    SELECT nom_entreprise, site_web FROM prospects
+                    WHERE nom_entreprise IN ({",".join("?" * len(noms))})
+                    OR site_web IN ({",".join("?" * len(sites))})
+                """, noms + sites)
+                for nom, site_web in cursor:
+                    noms_trouves.add(nom)
+                    if site_web:
+                        sites_trouves.add(site_web)
+            
+            conn.close()
+            return {
+                (nom, site_web) for nom, site_web in cles
+                if nom in noms_trouves or (site_web and site_web in sites_trouves)
+            }
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification des prospects: {e}")
+            return set()
+    
+    def obtenir_cles_prospects(self) -> Tuple[Set[str], Set[str]]:
+        """
+        Récupère les noms et sites web de tous les prospects enregistrés.
+        
+        Sert à pré-filtrer en mémoire les candidats avant d'interroger prospects_existent.
+        
+        Returns:
+            Tuple (noms d'entreprise, sites web non vides)
+        """
+        try:
+            conn = self._connecter()
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT nom_entreprise, site_web FROM prospects")
+            noms = set()
+            sites = set()
+            for nom, site_web in cursor:
+                noms.add(nom)
+                if site_web:
+                    sites.add(site_web)
+            
+            conn.close()
+            return noms, sites
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des prospects existants: {e}")
+            return set(), set()
+    
     def obtenir_statistiques(self) -> Dict[str, int]:
         """
         Récupère les statistiques de la base de données.
@@ -256,17 +363,17 @@ class ProspectDatabase:
             Dictionnaire avec les statistiques
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connecter()
             cursor = conn.cursor()
             
-            cursor.execute("SELECT COUNT(*) FROM prospects")
-            total = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM prospects WHERE email IS NOT NULL AND email != ''")
-            avec_email = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM prospects WHERE statut = 'traite'")
-            traites = cursor.fetchone()[0]
+            # Un seul parcours de la table pour les trois compteurs
+            cursor.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(email IS NOT NULL AND email != ''), 0),
+                       COALESCE(SUM(statut = 'traite'), 0)
+                FROM prospects
+            """)
+            total, avec_email, traites = cursor.fetchone()
             
             conn.close()
             
@@ -279,3 +386,81 @@ class ProspectDatabase:
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des statistiques: {e}")
             return {'total': 0, 'avec_email': 0, 'traites': 0}
+    
+    def lire_cache_api(self, source: str, cle: str) -> Tuple[bool, Any]:
+        """
+        Lit une réponse d'API en cache si elle n'a pas expiré.
+        
+        Args:
+            source: Nom de l'API (ex: "apollo", "hunter")
+            cle: Clé normalisée de la recherche
+        
+        Returns:
+            Tuple (trouvé, valeur) — la valeur peut être None pour un résultat négatif en cache
+        """
+        try:
+            conn = self._connecter()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT valeur FROM api_cache
+                WHERE source = ? AND cle = ? AND expire_le > ?
+            """, (source, cle, time.time()))
+            
+            row = cursor.fetchone()
+            conn.close()
+            
+            if row is None:
+                return False, None
+            return True, json.loads(row[0])
+            
+        except Exception as e:
+            logger.debug(f"Erreur lors de la lecture du cache {source}: {e}")
+            return False, None
+    
+    def enregistrer_cache_api(self, source: str, cle: str, valeur: Any, duree_secondes: float):
+        """
+        Enregistre (ou remplace) une réponse d'API dans le cache.
+        
+        Args:
+            source: Nom de l'API (ex: "apollo", "hunter")
+            cle: Clé normalisée de la recherche
+            valeur: Réponse à mettre en cache (sérialisable en JSON)
+            duree_secondes: Durée de validité de l'entrée
+        """
+        try:
+            conn = self._connecter()
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO api_cache (source, cle, valeur, expire_le)
+                VALUES (?, ?, ?, ?)
+            """, (source, cle, json.dumps(valeur, ensure_ascii=False), time.time() + duree_secondes))
+            
+            conn.commit()
+            conn.close()
+            
+        except Exception as e:
+            logger.debug(f"Erreur lors de l'écriture du cache {source}: {e}")
+    
+    def purger_cache_api(self) -> int:
+        """
+        Supprime les entrées expirées du cache des APIs.
+        
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        try:
+            conn = self._connecter()
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM api_cache WHERE expire_le <= ?", (time.time(),))
+            supprimees = cursor.rowcount
+            
+            conn.commit()
+            conn.close()
+            return supprimees
+            
+        except Exception as e:
+            logger.debug(f"Erreur lors de la purge du cache: {e}")
+            return 0
@@ -3,23 +3,74 @@ Module client pour l'API Google Maps Places - Recherche d'entreprises locales av
 """
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 
+from http_session import activer_reprises, creer_session
+from rate_limiter import RateLimiter
+from motifs import compiler_alternatives
+
 logger = logging.getLogger(__name__)
 
 
+# Mots-clés d'immobilier dans le nom du commerce
+_IMMOBILIER_EXCLUS = ("immobilier", "immobilière", "real estate", "agence immobilière")
+
+# Grandes chaînes, franchises et filiales
+_GRANDES_CHAINES = (
+    # Grandes surfaces suisses
+    "coop", "migros", "denner", "aldi", "lidl", "manor", "globus",
+    # E-commerce
+    "galaxus", "digitec", "amazon", "booking", "comparis", "ricardo",
+    # Grandes chaînes hôtels/restaurants/groups
+    "accor", "expedia", "tripadvisor", "airbnb", "trivago", "hotels.com",
+    # Restauration rapide
+    "mcdonald", "burger king", "kfc", "subway", "pizza hut", "domino",
+    "starbucks", "nespresso", "pret a manger",
+    # Mode
+    "zara", "h&m", "mango", "bershka", "c&a", "primark",
+    # Meubles/Décoration
+    "ikea", "conforama", "pfister", "micasa", "möbel pfister",
+    # Électronique
+    "media markt", "fnac", "saturn", "interdiscount",
+    # Télécom/Banque
+    "poste", "swisscom", "orange", "sunrise", "salt",
+    "ubs", "credit suisse", "raiffeisen", "postfinance",
+    # Autres grandes marques
+    "nike", "adidas", "puma", "decathlon", "interio",
+    # Indicateurs de filiales
+    "filiale", "succursale", "branch", "subsidiary"
+)
+
+# Grandes banques (les petites fiduciaires/cabinets comptables sont des PME valides)
+_GRANDES_BANQUES = ("ubs", "credit suisse", "raiffeisen bank", "postfinance", "bnp paribas", "societe generale")
+
+# Listes compilées une fois en une seule regex : un parcours du nom par commerce
+_NOM_EXCLU_RE = compiler_alternatives(_IMMOBILIER_EXCLUS, _GRANDES_CHAINES, _GRANDES_BANQUES)
+
+# Requêtes de détails Google Maps envoyées en même temps pour les résultats d'une recherche
+_DETAILS_SIMULTANES = 8
+
+
 class GoogleMapsClient:
     """Client pour interroger l'API Google Maps Places."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, requetes_par_minute: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialise le client Google Maps.
         
         Args:
             api_key: Clé API Google Maps
+            requetes_par_minute: Quota de requêtes par minute (None = pas de limite)
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.api_key = api_key
+        self.session = session or creer_session()
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
         self.base_url = "https://maps.googleapis.com/maps/api/place"
+        activer_reprises(self.session, self.base_url)
+        self._executor_details = ThreadPoolExecutor(max_workers=_DETAILS_SIMULTANES, thread_name_prefix="gmaps-details")
     
     def rechercher_commerces_locaux(self, ville: str, pays: str = "Suisse", 
                                      nombre_resultats: int = 20,
@@ -114,14 +165,18 @@ class GoogleMapsClient:
                     try:
                         # Limiter à max_per_type résultats par type pour avoir de la diversité
                         place_ids = self._recherche_textuelle_multiple(query, max_results=max_per_type, pays=pays)
+                        place_ids = [p for p in dict.fromkeys(place_ids) if p not in place_ids_trouves]
                         
-                        for place_id in place_ids:
-                            if place_id in place_ids_trouves or len(commerces) >= nombre_resultats:
-                                continue
+                        # Les détails des résultats sont indépendants : récupérés en parallèle,
+                        # puis traités dans l'ordre de la recherche
+                        details_par_place = self._executor_details.map(self._obtenir_details, place_ids)
+                        
+                        for place_id, details in zip(place_ids, details_par_place):
+                            if len(commerces) >= nombre_resultats:
+                                break
                             place_ids_trouves.add(place_id)
                             
                             try:
-                                details = self._obtenir_details(place_id)
                                 if details and self._est_commerce_local_valide(details, pays):
                                     commerce = {
                                         "nom_entreprise": details.get("name", ""),
@@ -138,7 +193,7 @@ class GoogleMapsClient:
                                     if not any(c.get("nom_entreprise") == commerce["nom_entreprise"] for c in commerces):
                                         commerces.append(commerce)
                             except Exception as e:
-                                logger.debug(f"Erreur lors de l'obtention des détails pour {place_id}: {e}")
+                                logger.debug("Erreur lors de l'obtention des détails pour %s: %s", place_id, e)
                                 continue
                     except Exception as e:
                         logger.debug(f"Erreur lors de la recherche '{query}': {e}")
@@ -256,66 +311,37 @@ class GoogleMapsClient:
                 if pays_cible_normalise == "qc":
                     # Si on cherche Québec, accepter seulement Québec
                     if pays_resultat != "qc":
-                        logger.debug(f"❌ Commerce exclu (pays={pays_resultat} au lieu de {pays_cible_normalise}): {name}")
+                        logger.debug("❌ Commerce exclu (pays=%s au lieu de %s): %s", pays_resultat, pays_cible_normalise, name)
                         return False
                 elif pays_cible_normalise == "ca":
                     # Si on cherche Canada, accepter Canada mais pas Québec seul
                     if pays_resultat not in ["ca", "qc"]:
-                        logger.debug(f"❌ Commerce exclu (pays={pays_resultat} au lieu de {pays_cible_normalise}): {name}")
+                        logger.debug("❌ Commerce exclu (pays=%s au lieu de %s): %s", pays_resultat, pays_cible_normalise, name)
                         return False
                 elif pays_cible_normalise == "ch":
                     # Si on cherche Suisse, exclure tout ce qui n'est pas Suisse
                     if pays_resultat != "ch":
-                        logger.debug(f"❌ Commerce exclu (pays={pays_resultat} au lieu de {pays_cible_normalise}): {name}")
+                        logger.debug("❌ Commerce exclu (pays=%s au lieu de %s): %s", pays_resultat, pays_cible_normalise, name)
                         return False
                 elif pays_cible_normalise == "fr":
                     # Si on cherche France, exclure tout ce qui n'est pas France
                     if pays_resultat != "fr":
-                        logger.debug(f"❌ Commerce exclu (pays={pays_resultat} au lieu de {pays_cible_normalise}): {name}")
+                        logger.debug("❌ Commerce exclu (pays=%s au lieu de %s): %s", pays_resultat, pays_cible_normalise, name)
                         return False
                 else:
                     # Pour les autres pays, comparaison stricte
                     if pays_resultat != pays_cible_normalise:
-                        logger.debug(f"❌ Commerce exclu (pays={pays_resultat} au lieu de {pays_cible_normalise}): {name}")
+                        logger.debug("❌ Commerce exclu (pays=%s au lieu de %s): %s", pays_resultat, pays_cible_normalise, name)
                         return False
         
         # Exclure l'immobilier
-        if "real_estate_agency" in types or any(mot in name for mot in ["immobilier", "immobilière", "real estate", "agence immobilière"]):
-            return False
-        
-        # Exclure les grandes chaînes, franchises et filiales
-        grandes_chaines = [
-            # Grandes surfaces suisses
-            "coop", "migros", "denner", "aldi", "lidl", "manor", "globus",
-            # E-commerce
-            "galaxus", "digitec", "amazon", "booking", "comparis", "ricardo",
-            # Grandes chaînes hôtels/restaurants/groups
-            "accor", "expedia", "tripadvisor", "airbnb", "trivago", "hotels.com",
-            # Restauration rapide
-            "mcdonald", "burger king", "kfc", "subway", "pizza hut", "domino",
-            "starbucks", "nespresso", "pret a manger",
-            # Mode
-            "zara", "h&m", "mango", "bershka", "c&a", "primark",
-            # Meubles/Décoration
-            "ikea", "conforama", "pfister", "micasa", "möbel pfister",
-            # Électronique
-            "media markt", "fnac", "saturn", "interdiscount",
-            # Télécom/Banque
-            "poste", "swisscom", "orange", "sunrise", "salt",
-            "ubs", "credit suisse", "raiffeisen", "postfinance",
-            # Autres grandes marques
-            "nike", "adidas", "puma", "decathlon", "interio",
-            # Indicateurs de filiales
-            "filiale", "succursale", "branch", "subsidiary"
-        ]
-        if any(chain in name for chain in grandes_chaines):
+        if "real_estate_agency" in types:
             return False
         
-        # Exclure les grandes banques mais permettre les petites fiduciaires/cabinets comptables (PME)
-        grandes_banques = ["ubs", "credit suisse", "raiffeisen bank", "postfinance", "bnp paribas", "societe generale"]
-        if any(banque in name for banque in grandes_banques):
+        # Exclure l'immobilier, les grandes chaînes, franchises et filiales, et les grandes banques
+        # (les petites fiduciaires/cabinets comptables restent des PME valides)
+        if _NOM_EXCLU_RE.search(name):
             return False
-        # Permettre les fiduciaires et cabinets comptables (sont des PME valides)
         
         return True
     
@@ -392,7 +418,9 @@ class GoogleMapsClient:
                 params["region"] = region_code
             
             try:
-                response = requests.get(url, params=params, timeout=(10, 30))
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.get(url, params=params, timeout=(10, 30))
                 response.raise_for_status()
                 data = response.json()
             except requests.exceptions.Timeout:
@@ -435,7 +463,9 @@ class GoogleMapsClient:
             }
             
             try:
-                response = requests.get(url, params=params, timeout=(10, 30))
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.get(url, params=params, timeout=(10, 30))
                 response.raise_for_status()
                 data = response.json()
             except requests.exceptions.Timeout:
@@ -510,7 +540,9 @@ class GoogleMapsClient:
                 params["region"] = region_code
             
             try:
-                response = requests.get(url, params=params, timeout=(10, 30))
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.get(url, params=params, timeout=(10, 30))
                 response.raise_for_status()
                 data = response.json()
             except requests.exceptions.Timeout:
@@ -0,0 +1,56 @@
+"""
+Session HTTP partagée entre les clients API pour réutiliser les connexions (keep-alive TCP/TLS).
+"""
+import http.cookiejar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Nouvelles tentatives sur les APIs : quota dépassé (429), erreurs serveur et coupures réseau transitoires.
+# Méthodes idempotentes seulement (défaut d'urllib3) : un POST qui a expiré a pu être traité et
+# facturé côté serveur (recherche Serper/Apollo, vérification groupée ZeroBounce), il n'est pas renvoyé
+_REPRISES_API = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,  # la dernière réponse est rendue au client, qui gère l'erreur comme avant
+)
+
+
+def creer_session(connexions_par_hote: int = 20, hotes_en_cache: int = 50) -> requests.Session:
+    """
+    Crée une session requests avec un pool de connexions dimensionné pour les workers.
+
+    Les cookies sont refusés : la session est partagée entre toutes les APIs et les sites
+    scrappés, chaque requête doit rester indépendante comme avec requests.get.
+
+    Args:
+        connexions_par_hote: Connexions gardées ouvertes par hôte (requêtes simultanées vers une même API)
+        hotes_en_cache: Nombre d'hôtes dont le pool de connexions est conservé
+
+    Returns:
+        Session prête à être passée aux clients
+    """
+    session = requests.Session()
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+    adaptateur = HTTPAdapter(pool_connections=hotes_en_cache, pool_maxsize=connexions_par_hote)
+    session.mount("https://", adaptateur)
+    session.mount("http://", adaptateur)
+    return session
+
+
+def activer_reprises(session: requests.Session, url_base: str, connexions_par_hote: int = 20):
+    """
+    Retente automatiquement les erreurs transitoires des requêtes vers une API.
+    
+    Limité aux URLs de l'API : les sites scrappés (souvent lents ou hors ligne) ne sont pas
+    retentés, pour ne pas bloquer un worker plusieurs secondes sur un site mort.
+    
+    Args:
+        session: Session partagée
+        url_base: Préfixe des URLs de l'API (ex: "https://api.hunter.io/v2")
+        connexions_par_hote: Connexions gardées ouvertes vers l'API
+    """
+    session.mount(url_base, HTTPAdapter(pool_maxsize=connexions_par_hote, max_retries=_REPRISES_API))
@@ -4,25 +4,96 @@ Module client pour l'API Hunter.io - Recherche d'emails et d'informations de dir
 import requests
 import logging
 import re
-from typing import Dict, Any, Optional, Tuple
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
+from http_session import activer_reprises, creer_session
+from rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
+# Parser HTML : lxml (C) si installé, sinon le parser pur Python de la bibliothèque standard
+try:
+    import lxml  # noqa: F401
+    _PARSER_HTML = 'lxml'
+except ImportError:
+    _PARSER_HTML = 'html.parser'
+
+# Balises sans texte visible : retirées avant extraction (faux emails dans le JS, texte inutile)
+_BALISES_NON_TEXTUELLES = ['script', 'style', 'noscript', 'svg', 'template']
+
+# Nombre maximum d'emails examinés par page
+_MAX_EMAILS_PAR_PAGE = 100
+
+# Emails génériques (pas rattachés à une personne) : une alternation compilée par usage
+_GENERIC_EMAIL_RE = re.compile(r'^(?:info|contact|hello|noreply|no-reply|webmaster)@', re.I)
+_GENERIC_EMAIL_NO_NAME_RE = re.compile(r'^(?:info|contact|hello|noreply|no-reply|webmaster|support)@', re.I)
+_GENERIC_EMAIL_CONTACT_PAGE_RE = re.compile(
+    r'^(?:info|contact|hello|noreply|no-reply|webmaster|support|sales|admin)@', re.I
+)
+_AUTOMATED_EMAIL_RE = re.compile(r'^(?:noreply|no-reply|webmaster|support|sales|admin|automated)@', re.I)
+
+# Expressions régulières compilées une seule fois (utilisées sur chaque page scrapée)
+_EMAIL_RE = re.compile(r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b')
+_NAME_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
+# Nom propre plausible : 2 à 4 mots capitalisés, hors mots de navigation ("Contact Nous",
+# "Qui Sommes"...), dont le dernier diffère du premier (groupe 1 = nom complet)
+_NAME_WORD = r'(?!(?:Contact|Contacter|Nous|Qui|Sommes|About|Us)\b)[A-Z][a-z]+'
+_STRONG_NAME_RE = re.compile(
+    rf'\b(({_NAME_WORD})(?:\s+{_NAME_WORD}){{0,2}}\s+(?!\2\b){_NAME_WORD})\b'
+)
+_CAPITALIZED_WORDS_RE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)')
+_NAME_CLEAN_RE = re.compile(r'[^\w\s\-\.]')
+_LEADER_SECTION_CLASS_RE = re.compile(r'team|about|equipe|management|direction', re.I)
+_LINKEDIN_ROLE_CLASS_RE = re.compile(r'role|title|poste|position', re.I)
+_LINKEDIN_PROFILE_RE = re.compile(r'linkedin\.com/in/[^/]+/?$', re.I)
+_LINKEDIN_HREF_RE = re.compile(r'linkedin\.com/in/', re.I)
+# Sélecteurs CSS des cards d'équipe / sections "à propos" (évalués par soupsieve en un seul parcours)
+_TEAM_SELECTOR = (
+    ':is(div, article, section):is([class*="team" i], [class*="member" i], '
+    '[class*="person" i], [class*="staff" i], [class*="employee" i])'
+)
+_ABOUT_SELECTOR = ':is(div, section):is([class*="about" i], [class*="qui-sommes" i])'
+_NAME_TAGS_SELECTOR = 'h1, h2, h3, h4, h5, strong, b'
+_ROLE_SELECTOR = (
+    ':is(p, span, div):is([class*="role" i], [class*="title" i], '
+    '[class*="poste" i], [class*="position" i], [class*="job" i])'
+)
+# Mot entièrement alphabétique commençant par une minuscule (disqualifie un nom propre)
+_LOWERCASE_WORD_RE = re.compile(r'(?<!\S)[a-zß-öø-ÿ][^\W\d_]*(?!\S)')
+# Mots-clés de poste cherchés sur les pages du site (structure et profils), par ordre de priorité
+_POSTES_SITE = ("directeur", "ceo", "fondateur", "président", "gérant", "manager", "responsable", "owner")
+# Présence d'un de ces mots en une seule passe (insensible à la casse)
+_POSTE_SITE_RE = re.compile("|".join(_POSTES_SITE), re.I)
+# Mots-clés de poste cherchés autour d'un nom dans les résultats Serper, par ordre de priorité
+_POSTES_CONTEXTE = ("directeur", "gérant", "fondateur", "président", "ceo", "manager", "responsable", "propriétaire")
+# Découpage prénom.nom / prénom_nom de la partie locale d'un email
+_LOCAL_SPLIT_RE = re.compile(r'[._]')
+_GENERIC_LOCAL_PARTS = frozenset({'contact', 'info', 'admin', 'hello', 'sales', 'support'})
+# Fin de la partie hôte d'une URL (chemin, requête ou fragment)
+_FIN_HOTE_RE = re.compile(r'[/?#]')
+
 
 class HunterClient:
     """Client pour interroger l'API Hunter.io."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, requetes_par_minute: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialise le client Hunter.io.
         
         Args:
             api_key: Clé API Hunter.io
+            requetes_par_minute: Quota de requêtes par minute (None = pas de limite)
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.api_key = api_key
+        self.session = session or creer_session()
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
         self.base_url = "https://api.hunter.io/v2"
+        activer_reprises(self.session, self.base_url)
     
     def trouver_email_dirigeant(self, site_web: str, nom_entreprise: str) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
         """
@@ -41,12 +112,11 @@ class HunterClient:
             logger.info(f"Scraping du site web pour trouver le dirigeant: {site_web}")
             dirigeant_scrape, email_scrape = self._scraper_dirigeant_site_web(site_web)
             
-            
             if dirigeant_scrape and email_scrape:
                 logger.info(f"Dirigeant trouvé via scraping: {dirigeant_scrape['nom']} ({dirigeant_scrape['poste']})")
                 return email_scrape, dirigeant_scrape
             
-            # Méthode 2: Domain Search via Hunter.io
+            # Méthode 2: Domain Search via Hunter.io (payant : seulement si le scraping a échoué)
             domain = self._extraire_domaine(site_web)
             if domain:
                 email, dirigeant_info = self._chercher_dirigeant_par_domaine(domain, nom_entreprise)
@@ -97,7 +167,9 @@ class HunterClient:
                 "limit": 10
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            if self._limiteur:
+                self._limiteur.attendre()
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -153,17 +225,16 @@ class HunterClient:
         """
         try:
             # Scraper le site pour trouver des emails
-            response = requests.get(site_web, timeout=10, headers={
+            response = self.session.get(site_web, timeout=10, headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             })
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self._parser_html(response.text)
             texte = soup.get_text()
             
             # Patterns d'emails génériques
-            pattern = r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b'
-            emails = re.findall(pattern, texte)
+            emails = _EMAIL_RE.findall(texte)
             
             # Filtrer les emails génériques préférés
             emails_preferes = ["contact", "info", "hello", "bonjour", "commercial"]
@@ -178,7 +249,7 @@ class HunterClient:
             domaine = self._extraire_domaine(site_web)
             if domaine:
                 for email in emails:
-                    if domaine in email:
+                    if domaine in email.lower():
                         logger.info(f"Email du domaine trouvé: {email}")
                         return email
             
@@ -188,6 +259,21 @@ class HunterClient:
             logger.warning(f"Erreur lors de la recherche d'email générique sur {site_web}: {e}")
             return None
     
+    def _parser_html(self, html: str) -> BeautifulSoup:
+        """
+        Parse une page HTML en retirant les balises sans texte visible (scripts, styles, etc.).
+        
+        Args:
+            html: Contenu HTML de la page
+        
+        Returns:
+            BeautifulSoup object nettoyé
+        """
+        soup = BeautifulSoup(html, _PARSER_HTML)
+        for balise in soup(_BALISES_NON_TEXTUELLES):
+            balise.decompose()
+        return soup
+    
     def _scraper_dirigeant_site_web(self, site_web: str) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
         """
         Scrape le site web pour trouver les informations d'un contact (dirigeant ou responsable).
@@ -234,10 +320,10 @@ class HunterClient:
             for page_contact in pages_contact:
                 try:
                     url_contact = f"{base_url}{page_contact}"
-                    response = requests.get(url_contact, timeout=15, headers=headers, allow_redirects=True)
+                    response = self.session.get(url_contact, timeout=15, headers=headers, allow_redirects=True)
                     
                     if response.status_code == 200:
-                        soup_contact = BeautifulSoup(response.text, 'html.parser')
+                        soup_contact = self._parser_html(response.text)
                         # Chercher directement des contacts (emails + noms) sur la page de contact
                         contact_direct = self._extraire_contact_depuis_page_contact(soup_contact)
                         if contact_direct:
@@ -249,12 +335,12 @@ class HunterClient:
             for page in pages_a_visiter:
                 try:
                     url = f"{base_url}{page}" if page else base_url
-                    response = requests.get(url, timeout=15, headers=headers, allow_redirects=True)
+                    response = self.session.get(url, timeout=15, headers=headers, allow_redirects=True)
                     
                     if response.status_code != 200:
                         continue
                     
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = self._parser_html(response.text)
                     texte_complet = soup.get_text().lower()
                     
                     # PRIORITÉ 1: Chercher des contacts avec LinkedIn (le plus fiable)
@@ -287,17 +373,20 @@ class HunterClient:
                             meilleur_email = email
                     
                     # PRIORITÉ 3: Chercher les patterns de dirigeants dans le texte
-                    for poste_recherche in postes_recherches:
-                        if poste_recherche in texte_complet:
+                    # (seul le premier contact trouvé est conservé : inutile de chercher au-delà)
+                    if not meilleur_contact:
+                        for poste_recherche in postes_recherches:
+                            if poste_recherche not in texte_complet:
+                                continue
                             dirigeant = self._extraire_nom_dirigeant_texte_ameliore(soup, poste_recherche)
                             if dirigeant:
                                 email = self._extraire_email_du_texte(soup, dirigeant["nom"])
                                 linkedin = self._chercher_linkedin_contact(soup, dirigeant["nom"])
                                 if linkedin:
                                     dirigeant["linkedin"] = linkedin
-                                if not meilleur_contact:
-                                    meilleur_contact = dirigeant
-                                    meilleur_email = email
+                                meilleur_contact = dirigeant
+                                meilleur_email = email
+                                break
                     
                     # PRIORITÉ 4: Chercher dans les balises spécifiques
                     dirigeant_balises = self._chercher_dirigeant_balises(soup, postes_recherches)
@@ -340,14 +429,18 @@ class HunterClient:
             Dict avec nom et poste ou None
         """
         try:
+            # Le texte de la page est déjà en minuscules : inutile de parcourir le DOM si le poste n'y est pas
+            if poste not in texte_complet:
+                return None
+            
             # Chercher dans les éléments HTML pour trouver le nom proche du poste
             elements = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'div', 'span', 'strong', 'b'])
             
             for element in elements:
-                texte_elem = element.get_text().lower()
-                if poste in texte_elem:
+                texte_brut = element.get_text()
+                if poste in texte_brut.lower():
                     # Essayer d'extraire un nom (généralement en majuscules ou titre)
-                    nom_complet = element.get_text().strip()
+                    nom_complet = texte_brut.strip()
                     
                     # Pattern pour trouver un nom (prénom + nom, généralement 2-4 mots)
                     mots = nom_complet.split()
@@ -386,29 +479,42 @@ class HunterClient:
         """
         try:
             # Chercher dans les sections "team", "about", etc.
-            sections = soup.find_all(['section', 'div'], class_=re.compile(r'team|about|equipe|management|direction', re.I))
+            sections = soup.find_all(['section', 'div'], class_=_LEADER_SECTION_CLASS_RE)
+            
+            # Textes des parents déjà passés en minuscules (souvent partagés entre plusieurs noms)
+            textes_parents = {}
             
             for section in sections:
                 texte_section = section.get_text().lower()
                 
-                for poste in postes_recherches:
-                    if poste in texte_section:
-                        # Chercher les noms dans cette section (généralement en strong, h3, etc.)
-                        noms = section.find_all(['h1', 'h2', 'h3', 'h4', 'strong', 'b'])
-                        
-                        for nom_elem in noms:
-                            nom_texte = nom_elem.get_text().strip()
-                            mots = nom_texte.split()
-                            
-                            # Un nom de dirigeant fait généralement 2-3 mots
-                            if 2 <= len(mots) <= 3 and len(nom_texte) > 5:
-                                # Vérifier qu'on est dans un contexte de dirigeant
-                                parent_text = nom_elem.find_parent().get_text().lower() if nom_elem.find_parent() else ""
-                                if any(p in parent_text for p in postes_recherches):
-                                    return {
-                                        "nom": nom_texte,
-                                        "poste": poste.title()
-                                    }
+                # Le résultat de la recherche de noms ne dépend pas du poste :
+                # seul le premier poste présent dans la section est utile
+                poste = next((p for p in postes_recherches if p in texte_section), None)
+                if not poste:
+                    continue
+                
+                # Chercher les noms dans cette section (généralement en strong, h3, etc.)
+                noms = section.find_all(['h1', 'h2', 'h3', 'h4', 'strong', 'b'])
+                
+                for nom_elem in noms:
+                    nom_texte = nom_elem.get_text().strip()
+                    mots = nom_texte.split()
+                    
+                    # Un nom de dirigeant fait généralement 2-3 mots
+                    if 2 <= len(mots) <= 3 and len(nom_texte) > 5:
+                        # Vérifier qu'on est dans un contexte de dirigeant
+                        parent = nom_elem.parent
+                        if parent is None:
+                            continue
+                        parent_text = textes_parents.get(id(parent))
+                        if parent_text is None:
+                            parent_text = parent.get_text().lower()
+                            textes_parents[id(parent)] = parent_text
+                        if any(p in parent_text for p in postes_recherches):
+                            return {
+                                "nom": nom_texte,
+                                "poste": poste.title()
+                            }
             
             return None
             
@@ -428,9 +534,9 @@ class HunterClient:
             Email trouvé ou None
         """
         try:
-            # Chercher tous les emails dans la page
+            # Chercher tous les emails dans la page (borné pour les pages pathologiques)
             texte_complet = soup.get_text()
-            emails = re.findall(r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b', texte_complet)
+            emails = _EMAIL_RE.findall(texte_complet)[:_MAX_EMAILS_PAR_PAGE]
             
             if not emails:
                 return None
@@ -438,26 +544,24 @@ class HunterClient:
             # Essayer de trouver l'email associé au nom (chercher près du nom dans le HTML)
             mots_nom = nom_dirigeant.lower().split()
             if len(mots_nom) >= 2:
-                prenom = mots_nom[0]
-                nom = mots_nom[-1]
-                
-                # Chercher un email qui contient le prénom ou le nom
-                for email in emails:
-                    email_lower = email.lower()
-                    if prenom[:3] in email_lower or nom[:4] in email_lower:
-                        return email
+                prefixe_prenom = mots_nom[0][:3]
+                prefixe_nom = mots_nom[-1][:4]
                 
-                # Si pas de match exact, prendre le premier email professionnel (pas info@, contact@, etc.)
+                # Un seul passage : email qui contient le prénom ou le nom, sinon
+                # le premier email professionnel (pas info@, contact@, etc.)
+                premier_non_generique = None
                 for email in emails:
                     email_lower = email.lower()
-                    if not any(generic in email_lower for generic in ["info@", "contact@", "hello@", "noreply@", "no-reply@", "webmaster@"]):
+                    if prefixe_prenom in email_lower or prefixe_nom in email_lower:
                         return email
+                    if premier_non_generique is None and not _GENERIC_EMAIL_RE.match(email):
+                        premier_non_generique = email
+                return premier_non_generique
             
             # Si pas de nom donné, retourner le premier email non générique trouvé
             if not nom_dirigeant:
                 for email in emails:
-                    email_lower = email.lower()
-                    if not any(generic in email_lower for generic in ["info@", "contact@", "hello@", "noreply@", "no-reply@", "webmaster@", "support@"]):
+                    if not _GENERIC_EMAIL_NO_NAME_RE.match(email):
                         return email
             
             return None
@@ -478,7 +582,7 @@ class HunterClient:
         """
         try:
             # Chercher tous les liens LinkedIn personnels (pas les pages company)
-            linkedin_links = soup.find_all('a', href=re.compile(r'linkedin\.com/in/[^/]+/?$', re.I))
+            linkedin_links = soup.find_all('a', href=_LINKEDIN_PROFILE_RE)
             
             if not linkedin_links:
                 return None
@@ -526,17 +630,15 @@ class HunterClient:
             # Chercher dans le parent immédiat
             parent = link_element.parent
             if parent:
-                texte_parent = parent.get_text().strip()
-                
                 # Chercher dans la structure HTML courante : nom dans h3/h4/strong, poste dans p/span
                 # Pattern 1: Card de team member
                 nom_elem = parent.find(['h3', 'h4', 'h5', 'strong', 'b'])
-                poste_elem = parent.find(['p', 'span', 'div'], class_=re.compile(r'role|title|poste|position', re.I))
+                poste_elem = parent.find(['p', 'span', 'div'], class_=_LINKEDIN_ROLE_CLASS_RE)
                 
                 if nom_elem:
                     nom = nom_elem.get_text().strip()
                     # Nettoyer le nom (enlever les caractères spéciaux)
-                    nom = re.sub(r'[^\w\s\-\.]', '', nom).strip()
+                    nom = _NAME_CLEAN_RE.sub('', nom).strip()
                     mots_nom = nom.split()
                     
                     if 2 <= len(mots_nom) <= 4:
@@ -548,11 +650,11 @@ class HunterClient:
                             poste = poste_elem.get_text().strip()
                         else:
                             # Chercher dans les siblings ou les enfants
+                            # Un seul get_text() par sibling, recherche insensible à la casse par regex
                             for sibling in parent.find_all(['p', 'span', 'div']):
-                                texte = sibling.get_text().strip().lower()
-                                if any(mot in texte for mot in ["directeur", "ceo", "fondateur", "président", 
-                                                                 "gérant", "manager", "responsable", "owner"]):
-                                    poste = sibling.get_text().strip()
+                                texte = sibling.get_text().strip()
+                                if _POSTE_SITE_RE.search(texte):
+                                    poste = texte
                                     break
                         
                         return {
@@ -578,6 +680,8 @@ class HunterClient:
                                 }
                 
                 # Pattern 3: Extraire depuis le texte du parent si simple
+                # (texte du parent calculé seulement si les patterns précédents n'ont rien donné)
+                texte_parent = parent.get_text().strip()
                 if texte_parent and len(texte_parent) < 100:
                     mots = texte_parent.split()
                     if 2 <= len(mots) <= 6:
@@ -623,19 +727,14 @@ class HunterClient:
         try:
             # 1. Chercher tous les emails sur la page
             texte_complet = soup.get_text()
-            emails = re.findall(r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b', texte_complet)
+            emails = _EMAIL_RE.findall(texte_complet)
             
             if not emails:
                 return None
             
             # Filtrer les emails génériques (mais être moins restrictif)
-            emails_pertinents = []
-            for email in emails:
-                email_lower = email.lower()
-                # Exclure vraiment génériques, mais garder contact@ si c'est le seul
-                if not any(generic in email_lower for generic in 
-                    ["noreply@", "no-reply@", "webmaster@", "support@", "sales@", "admin@", "automated@"]):
-                    emails_pertinents.append(email)
+            # Exclure vraiment génériques, mais garder contact@ si c'est le seul
+            emails_pertinents = [email for email in emails if not _AUTOMATED_EMAIL_RE.match(email)]
             
             if not emails_pertinents:
                 # Prendre le premier email même s'il est générique
@@ -645,12 +744,15 @@ class HunterClient:
             
             # 2. Chercher un nom près de cet email dans le HTML
             nom_trouve = None
+            # Les mêmes ancêtres sont remontés pour chaque email : leur texte n'est calculé qu'une fois
+            textes_elements = {}
+            # Un seul parcours du DOM pour localiser les nœuds texte des emails candidats
+            noeuds_par_email = self._indexer_noeuds_emails(soup, emails_pertinents[:3])
             
             # Chercher l'élément qui contient cet email
             for email in emails_pertinents[:3]:  # Essayer les 3 premiers
                 # Chercher dans le HTML
-                email_pattern = re.compile(re.escape(email), re.I)
-                elements = soup.find_all(string=email_pattern)
+                elements = noeuds_par_email.get(email.lower(), [])
                 
                 for elem_text in elements:
                     # Chercher dans le parent et les éléments voisins
@@ -659,36 +761,20 @@ class HunterClient:
                         continue
                     
                     # Chercher dans un rayon de 200 caractères autour de l'email
-                    try:
-                        # Obtenir le texte du parent et de ses siblings proches
-                        contexte_elem = parent
-                        for _ in range(3):  # Remonter jusqu'à 3 niveaux
-                            parent_text = contexte_elem.get_text()
-                            
-                            # Pattern pour nom (2-4 mots, majuscules)
-                            pattern = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
-                            matches = pattern.findall(parent_text)
-                            
-                            for match in matches[:5]:
-                                mots = match.split()
-                                # Vérifier que c'est un vrai nom
-                                if 2 <= len(mots) <= 4 and len(match) > 5:
-                                    # Vérifier que ce n'est pas un mot répété
-                                    if mots[0].lower() != mots[-1].lower():
-                                        # Vérifier que ce n'est pas juste "Contact Nous" ou similaire
-                                        if not any(common in match.lower() for common in 
-                                            ["contact nous", "nous contacter", "qui sommes", "about us"]):
-                                            nom_trouve = match
-                                            break
-                            
-                            if nom_trouve:
-                                break
-                            
-                            contexte_elem = contexte_elem.parent
-                            if not contexte_elem:
-                                break
-                    except:
-                        continue
+                    # Obtenir le texte du parent et de ses siblings proches
+                    contexte_elem = parent
+                    for _ in range(3):  # Remonter jusqu'à 3 niveaux
+                        if contexte_elem is None:
+                            break
+                        parent_text = self._texte_element(contexte_elem, textes_elements)
+                        
+                        # Pattern pour nom (2-4 mots, majuscules, pas de mot répété ni "Contact Nous")
+                        match = _STRONG_NAME_RE.search(parent_text)
+                        if match and len(match.group(1)) > 5:
+                            nom_trouve = match.group(1)
+                            break
+                        
+                        contexte_elem = contexte_elem.parent
                     
                     if nom_trouve:
                         break
@@ -698,12 +784,12 @@ class HunterClient:
             
             # 3. Si pas de nom trouvé, essayer d'extraire depuis l'email
             if not nom_trouve and email_trouve:
-                partie_locale = email_trouve.split('@')[0].lower()
+                partie_locale = email_trouve.partition('@')[0].lower()
                 if '.' in partie_locale or '_' in partie_locale:
-                    parties = re.split('[._]', partie_locale)
+                    parties = _LOCAL_SPLIT_RE.split(partie_locale)
                     if len(parties) >= 2:
                         # Filtrer les parties trop courtes ou génériques
-                        parties_valides = [p for p in parties[:3] if len(p) > 2 and p not in ['contact', 'info', 'admin']]
+                        parties_valides = [p for p in parties[:3] if len(p) > 2 and p not in _GENERIC_LOCAL_PARTS]
                         if len(parties_valides) >= 2:
                             nom_trouve = ' '.join([p.capitalize() for p in parties_valides[:2]])
             
@@ -720,6 +806,50 @@ class HunterClient:
             logger.debug(f"Erreur lors de l'extraction contact par email: {e}")
             return None
     
+    def _indexer_noeuds_emails(self, soup: BeautifulSoup, emails: List[str]) -> Dict[str, List[Any]]:
+        """
+        Localise en un seul parcours du DOM les nœuds texte contenant les emails donnés.
+        
+        Args:
+            soup: BeautifulSoup object
+            emails: Emails candidats
+        
+        Returns:
+            Dict email (minuscules) -> liste des nœuds texte qui le contiennent, dans l'ordre du document
+        """
+        emails_cherches = {email.lower() for email in emails}
+        noeuds_par_email: Dict[str, List[Any]] = {}
+        
+        for noeud in soup.find_all(string=True):
+            if '@' not in noeud:
+                continue
+            for match in _EMAIL_RE.finditer(noeud):
+                email = match.group(1).lower()
+                if email not in emails_cherches:
+                    continue
+                noeuds = noeuds_par_email.setdefault(email, [])
+                if not noeuds or noeuds[-1] is not noeud:
+                    noeuds.append(noeud)
+        
+        return noeuds_par_email
+    
+    def _texte_element(self, elem, textes_elements: Dict[int, str]) -> str:
+        """
+        Retourne le texte d'un élément en ne parcourant son sous-arbre qu'une fois.
+        
+        Args:
+            elem: Élément BeautifulSoup
+            textes_elements: Cache (id de l'élément -> texte) propre à une page
+        
+        Returns:
+            Texte de l'élément
+        """
+        texte = textes_elements.get(id(elem))
+        if texte is None:
+            texte = elem.get_text()
+            textes_elements[id(elem)] = texte
+        return texte
+    
     def _chercher_contact_dans_structures(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         """
         Cherche un contact dans les structures HTML courantes (cards, team members, etc.).
@@ -730,58 +860,43 @@ class HunterClient:
         Returns:
             Dict avec nom et poste ou None
         """
-        try:
-            # Chercher dans les structures de team member
-            structures = [
-                # Cards de team
-                soup.find_all(['div', 'article', 'section'], class_=re.compile(r'team|member|person|staff|employee', re.I)),
-                # Sections about
-                soup.find_all(['div', 'section'], class_=re.compile(r'about|qui-sommes', re.I)),
-            ]
-            
-            for structure_list in structures:
-                for elem in structure_list[:10]:  # Limiter à 10 pour performance
-                    # Chercher nom dans h1-h5, strong, b
-                    nom_elem = elem.find(['h1', 'h2', 'h3', 'h4', 'h5', 'strong', 'b'])
-                    if not nom_elem:
-                        continue
+        # Chercher dans les structures de team member : cards de team, puis sections about
+        for selecteur in (_TEAM_SELECTOR, _ABOUT_SELECTOR):
+            for elem in soup.select(selecteur, limit=10):  # Limiter à 10 pour performance
+                # Chercher nom dans h1-h5, strong, b
+                nom_elem = elem.select_one(_NAME_TAGS_SELECTOR)
+                if not nom_elem:
+                    continue
+                
+                nom = nom_elem.get_text().strip()
+                # Nettoyer
+                nom = _NAME_CLEAN_RE.sub('', nom).strip()
+                mots_nom = nom.split()
+                
+                if 2 <= len(mots_nom) <= 4:
+                    nom_propre = " ".join(mots_nom[:2])
                     
-                    nom = nom_elem.get_text().strip()
-                    # Nettoyer
-                    nom = re.sub(r'[^\w\s\-\.]', '', nom).strip()
-                    mots_nom = nom.split()
+                    # Chercher poste dans p, span, div avec classes spécifiques
+                    poste_elem = elem.select_one(_ROLE_SELECTOR)
+                    poste = poste_elem.get_text().strip() if poste_elem else None
                     
-                    if 2 <= len(mots_nom) <= 4:
-                        nom_propre = " ".join(mots_nom[:2])
-                        
-                        # Chercher poste dans p, span, div avec classes spécifiques
-                        poste_elem = elem.find(['p', 'span', 'div'], 
-                                              class_=re.compile(r'role|title|poste|position|job', re.I))
-                        poste = poste_elem.get_text().strip() if poste_elem else None
-                        
-                        # Si pas de poste trouvé, chercher dans le texte
-                        if not poste:
-                            texte_elem = elem.get_text().lower()
-                            postes_cherches = ["directeur", "ceo", "fondateur", "président", 
-                                              "gérant", "manager", "responsable", "owner"]
-                            for poste_cherche in postes_cherches:
-                                if poste_cherche in texte_elem:
-                                    # Extraire le poste du texte
-                                    idx = texte_elem.find(poste_cherche)
-                                    contexte = elem.get_text()[max(0, idx-20):idx+40]
-                                    poste = contexte.strip()
-                                    break
-                        
-                        return {
-                            "nom": nom_propre,
-                            "poste": poste or "Contact"
-                        }
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Erreur lors de la recherche dans structures: {e}")
-            return None
+                    # Si pas de poste trouvé, chercher dans le texte
+                    if not poste:
+                        texte_elem = elem.get_text()
+                        texte_minuscule = texte_elem.lower()
+                        for poste_cherche in _POSTES_SITE:
+                            idx = texte_minuscule.find(poste_cherche)
+                            if idx != -1:
+                                # Extraire le poste du texte
+                                poste = texte_elem[max(0, idx-20):idx+40].strip()
+                                break
+                    
+                    return {
+                        "nom": nom_propre,
+                        "poste": poste or "Contact"
+                    }
+        
+        return None
     
     def _extraire_nom_dirigeant_texte_ameliore(self, soup: BeautifulSoup, poste: str) -> Optional[Dict[str, str]]:
         """
@@ -794,41 +909,48 @@ class HunterClient:
         Returns:
             Dict avec nom et poste ou None
         """
-        try:
-            # Chercher dans les éléments structurés d'abord
-            for elem in soup.find_all(['div', 'section', 'article', 'li']):
-                texte = elem.get_text().lower()
-                if poste in texte:
-                    # Chercher un nom dans cet élément
-                    nom_elems = elem.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'strong', 'b'])
-                    for nom_elem in nom_elems:
-                        nom_texte = nom_elem.get_text().strip()
-                        mots = nom_texte.split()
-                        if 2 <= len(mots) <= 4 and all(mot[0].isupper() or mot.isupper() for mot in mots if mot.isalpha()):
-                            return {
-                                "nom": " ".join(mots[:2]),
-                                "poste": poste.title()
-                            }
-                    
-                    # Chercher dans le texte complet de l'élément
-                    texte_complet = elem.get_text()
-                    # Pattern: "Prénom NOM - Poste" ou "Poste: Prénom NOM"
-                    pattern = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', re.MULTILINE)
-                    matches = pattern.findall(texte_complet)
-                    if matches:
-                        for match in matches[:3]:
-                            mots_match = match.split()
-                            if 2 <= len(mots_match) <= 4:
-                                return {
-                                    "nom": " ".join(mots_match[:2]),
-                                    "poste": poste.title()
-                                }
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Erreur lors de l'extraction améliorée: {e}")
-            return None
+        # Localiser en un seul parcours les nœuds texte qui mentionnent le poste,
+        # puis n'examiner que leurs ancêtres proches (au lieu de tous les div/section/article/li)
+        poste_re = re.compile(re.escape(poste), re.I)
+        textes_elements = {}
+        elements_vus = set()
+        
+        for noeud in soup.find_all(string=poste_re):
+            elem = noeud.parent
+            for _ in range(3):  # Remonter jusqu'à 3 niveaux
+                if elem is None or elem is soup:
+                    break
+                if id(elem) in elements_vus:
+                    elem = elem.parent
+                    continue
+                elements_vus.add(id(elem))
+                
+                # Chercher un nom dans cet élément
+                nom_elems = elem.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'strong', 'b'])
+                for nom_elem in nom_elems:
+                    nom_texte = nom_elem.get_text().strip()
+                    mots = nom_texte.split()
+                    if 2 <= len(mots) <= 4 and not _LOWERCASE_WORD_RE.search(nom_texte):
+                        return {
+                            "nom": " ".join(mots[:2]),
+                            "poste": poste.title()
+                        }
+                
+                # Chercher dans le texte complet de l'élément
+                texte_complet = self._texte_element(elem, textes_elements)
+                # Pattern: "Prénom NOM - Poste" ou "Poste: Prénom NOM"
+                # finditer : on s'arrête aux 3 premières correspondances sans construire la liste complète
+                for m in islice(_CAPITALIZED_WORDS_RE.finditer(texte_complet), 3):
+                    mots_match = m.group(1).split()
+                    if 2 <= len(mots_match) <= 4:
+                        return {
+                            "nom": " ".join(mots_match[:2]),
+                            "poste": poste.title()
+                        }
+                
+                elem = elem.parent
+        
+        return None
     
     def _chercher_linkedin_contact(self, soup: BeautifulSoup, nom_contact: str) -> Optional[str]:
         """
@@ -841,27 +963,30 @@ class HunterClient:
         Returns:
             URL LinkedIn ou None
         """
-        try:
-            # Extraire les premières lettres du nom pour matching
-            mots_nom = nom_contact.lower().split()
-            if len(mots_nom) >= 2:
-                prenom = mots_nom[0][:3]
-                nom = mots_nom[-1][:4]
-                
-                # Chercher tous les liens LinkedIn
-                linkedin_links = soup.find_all('a', href=re.compile(r'linkedin\.com/in/', re.I))
+        # Extraire les premières lettres du nom pour matching
+        mots_nom = nom_contact.casefold().split()
+        if len(mots_nom) >= 2:
+            prenom = mots_nom[0][:3]
+            nom = mots_nom[-1][:4]
+            
+            # Chercher tous les liens LinkedIn
+            linkedin_links = soup.find_all('a', href=_LINKEDIN_HREF_RE)
+            
+            # Plusieurs liens partagent souvent le même parent (icônes d'une même card) :
+            # on n'extrait le texte de chaque parent qu'une seule fois
+            parents_vus = set()
+            for link in linkedin_links:
+                parent = link.parent
+                if parent is None or id(parent) in parents_vus:
+                    continue
+                parents_vus.add(id(parent))
                 
-                for link in linkedin_links:
-                    # Vérifier si le contexte autour du lien contient le nom
-                    parent_text = link.parent.get_text().lower() if link.parent else ""
-                    if prenom in parent_text or nom in parent_text:
-                        return link.get('href', '')
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Erreur lors de la recherche LinkedIn pour {nom_contact}: {e}")
-            return None
+                # Vérifier si le contexte autour du lien contient le nom
+                parent_text = parent.get_text().casefold()
+                if prenom in parent_text or nom in parent_text:
+                    return link.get('href', '')
+        
+        return None
     
     def _extraire_contact_depuis_page_contact(self, soup: BeautifulSoup) -> Optional[Dict[str, str]]:
         """
@@ -874,101 +999,90 @@ class HunterClient:
         Returns:
             Dict avec nom, email et poste (optionnel) ou None
         """
-        try:
-            # 1. Chercher tous les emails sur la page
-            texte_complet = soup.get_text()
-            emails = re.findall(r'\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b', texte_complet)
-            
-            if not emails:
-                return None
-            
-            # Filtrer les emails génériques
-            emails_pertinents = [e for e in emails if not any(generic in e.lower() for generic in 
-                ["info@", "contact@", "hello@", "noreply@", "no-reply@", "webmaster@", "support@", "sales@", "admin@"])]
-            
-            if not emails_pertinents:
-                # Si seulement des emails génériques, prendre le premier
-                emails_pertinents = [emails[0]]
-            
-            email_trouve = emails_pertinents[0]
-            
-            # 2. Chercher un nom associé à cet email dans le HTML
-            # Chercher autour de l'email (dans le même élément ou parent)
-            nom_trouve = None
-            poste_trouve = None
-            
-            # Chercher l'email dans le HTML
-            for email in emails_pertinents:
-                # Chercher dans les balises qui contiennent cet email
-                elements_avec_email = soup.find_all(string=re.compile(re.escape(email), re.I))
+        # 1. Chercher tous les emails sur la page
+        texte_complet = soup.get_text()
+        emails = _EMAIL_RE.findall(texte_complet)
+        
+        if not emails:
+            return None
+        
+        # Filtrer les emails génériques
+        emails_pertinents = [e for e in emails if not _GENERIC_EMAIL_CONTACT_PAGE_RE.match(e)]
+        
+        if not emails_pertinents:
+            # Si seulement des emails génériques, prendre le premier
+            emails_pertinents = [emails[0]]
+        
+        email_trouve = emails_pertinents[0]
+        
+        # 2. Chercher un nom associé à cet email dans le HTML
+        # Chercher autour de l'email (dans le même élément ou parent)
+        nom_trouve = None
+        poste_trouve = None
+        
+        textes_elements = {}
+        # Un seul parcours du DOM pour localiser les nœuds texte des emails candidats
+        noeuds_par_email = self._indexer_noeuds_emails(soup, emails_pertinents)
+        
+        # Chercher l'email dans le HTML
+        for email in emails_pertinents:
+            # Chercher dans les balises qui contiennent cet email
+            elements_avec_email = noeuds_par_email.get(email.lower(), [])
+            
+            for elem_text in elements_avec_email:
+                parent = elem_text.parent
+                if not parent:
+                    continue
                 
-                for elem_text in elements_avec_email:
-                    parent = elem_text.parent
-                    if not parent:
-                        continue
-                    
-                    # Chercher dans le texte autour de l'email (dans le parent et ses siblings)
-                    texte_contexte = parent.get_text()
-                    
-                    # Pattern pour trouver un nom (2-4 mots, commençant par majuscule)
-                    pattern_nom = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})\b')
-                    matches_nom = pattern_nom.findall(texte_contexte)
-                    
-                    for match_nom in matches_nom[:3]:  # Prendre les 3 premiers candidats
-                        mots = match_nom.split()
-                        # Vérifier que ça ressemble à un nom (pas un mot isolé, pas trop long)
-                        if 2 <= len(mots) <= 4 and len(match_nom) > 5:
-                            # Vérifier que ce n'est pas juste un mot répété
-                            if mots[0].lower() != mots[-1].lower():
-                                nom_trouve = match_nom
-                                break
-                    
-                    # Chercher aussi dans les balises voisines (h1-h6, strong, b, p)
-                    for tag in parent.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'b', 'p']):
-                        texte_tag = tag.get_text().strip()
-                        matches_tag = pattern_nom.findall(texte_tag)
-                        for match in matches_tag[:2]:
-                            mots = match.split()
-                            if 2 <= len(mots) <= 4 and len(match) > 5:
-                                nom_trouve = match
-                                break
-                    
-                    if nom_trouve:
-                        # Chercher un poste dans le contexte
-                        texte_lower = texte_contexte.lower()
-                        postes = ["directeur", "gérant", "fondateur", "président", "ceo", "manager", "responsable", "propriétaire"]
-                        for poste_mot in postes:
-                            if poste_mot in texte_lower:
-                                poste_trouve = poste_mot.title()
-                                break
-                        break
+                # Chercher dans le texte autour de l'email (dans le parent et ses siblings)
+                texte_contexte = self._texte_element(parent, textes_elements)
+                
+                # Pattern pour trouver un nom (2-4 mots, commençant par majuscule, pas de mot répété)
+                match_nom = _STRONG_NAME_RE.search(texte_contexte)
+                if match_nom and len(match_nom.group(1)) > 5:
+                    nom_trouve = match_nom.group(1)
+                
+                # Chercher aussi dans les balises voisines (h1-h6, strong, b, p)
+                for tag in parent.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'b', 'p']):
+                    texte_tag = tag.get_text().strip()
+                    for m in islice(_NAME_RE.finditer(texte_tag), 2):
+                        match = m.group(1)
+                        mots = match.split()
+                        if 2 <= len(mots) <= 4 and len(match) > 5:
+                            nom_trouve = match
+                            break
                 
                 if nom_trouve:
+                    # Chercher un poste dans le contexte
+                    texte_minuscule = texte_contexte.lower()
+                    for poste_mot in _POSTES_CONTEXTE:
+                        if poste_mot in texte_minuscule:
+                            poste_trouve = poste_mot.title()
+                            break
                     break
             
-            # 3. Si pas de nom trouvé, essayer d'extraire depuis l'email
-            if not nom_trouve:
-                # Extraire la partie locale de l'email (avant @)
-                partie_locale = email_trouve.split('@')[0].lower()
-                # Si c'est prénom.nom ou prénom_nom, essayer d'extraire
-                if '.' in partie_locale or '_' in partie_locale:
-                    parties = re.split('[._]', partie_locale)
-                    if len(parties) >= 2:
-                        # Capitaliser pour faire un nom
-                        nom_trouve = ' '.join([p.capitalize() for p in parties[:2]])
-            
-            if email_trouve:
-                return {
-                    "nom": nom_trouve or "Contact",
-                    "poste": poste_trouve or "Contact",
-                    "email": email_trouve
-                }
-            
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Erreur lors de l'extraction depuis page contact: {e}")
-            return None
+            if nom_trouve:
+                break
+        
+        # 3. Si pas de nom trouvé, essayer d'extraire depuis l'email
+        if not nom_trouve:
+            # Extraire la partie locale de l'email (avant @)
+            partie_locale = email_trouve.partition('@')[0]
+            # Si c'est prénom.nom ou prénom_nom, essayer d'extraire
+            if '.' in partie_locale or '_' in partie_locale:
+                parties = _LOCAL_SPLIT_RE.split(partie_locale)
+                if len(parties) >= 2:
+                    # Capitaliser pour faire un nom
+                    nom_trouve = ' '.join([p.capitalize() for p in parties[:2]])
+        
+        if email_trouve:
+            return {
+                "nom": nom_trouve or "Contact",
+                "poste": poste_trouve or "Contact",
+                "email": email_trouve
+            }
+        
+        return None
     
     def _extraire_domaine(self, url: str) -> Optional[str]:
         """
@@ -980,17 +1094,22 @@ class HunterClient:
         Returns:
             Domaine extrait ou None
         """
-        try:
+        # Cas rare (identifiants "user@hôte" ou IPv6 "[::1]") : laisser urlparse gérer
+        if '@' in url or '[' in url:
             if not url.startswith("http"):
                 url = "https://" + url
-            
-            parsed = urlparse(url)
-            domaine = parsed.netloc.replace("www.", "")
-            return domaine
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de l'extraction du domaine de {url}: {e}")
-            return None
+            domaine = urlparse(url).netloc.rpartition('@')[2]
+        else:
+            # Cas courant "http(s)://hôte/chemin" : simple découpage de chaîne
+            debut = url.find('://')
+            domaine = url[debut + 3:] if debut != -1 else url
+            fin = _FIN_HOTE_RE.search(domaine)
+            if fin:
+                domaine = domaine[:fin.start()]
+        
+        if domaine.startswith('www.'):
+            domaine = domaine[4:]
+        return domaine.lower() or None
     
     def chercher_linkedin_dirigeant(self, email: str, nom_dirigeant: str) -> Optional[str]:
         """
@@ -3,20 +3,33 @@ Agent de prospection B2B autonome.
 Traite une entreprise toutes les 15 secondes.
 """
 import os
+import re
+import sys
+import json
+import hashlib
+import functools
 import time
 import logging
+import threading
 import yaml
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Set
 from dotenv import load_dotenv
 from queue import Queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from database import ProspectDatabase
+from display_utils import (
+    print_header, print_section, print_info, print_box,
+    print_separator, wrap_text, Colors, print_success, print_warning
+)
+from http_session import creer_session
+from motifs import compiler_alternatives
 from serper_client import SerperClient
 from hunter_client import HunterClient
-from openai_client import OpenAIClient
+from openai_client import OpenAIClient, ERREURS_CONFIGURATION, message_par_defaut
 from apollo_client import ApolloClient
 from google_maps_client import GoogleMapsClient
-from zerobounce_client import ZeroBounceClient
+from zerobounce_client import ZeroBounceClient, VerificationEmailsGroupee
 from scoring import ProspectScoring
 from tech_detector import TechnologyDetector
 
@@ -28,9 +41,169 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Chargeur YAML en C (libyaml) si disponible, sinon l'implémentation Python
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Référence à une variable d'environnement dans une valeur YAML balisée !ENV
+_VARIABLE_ENV_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+class _ConfigLoader(_YamlLoader):
+    """Chargeur de config.yaml : `cle: !ENV "${VARIABLE}"` est résolu au chargement."""
+
+
+def _construire_valeur_env(loader: _ConfigLoader, noeud: yaml.Node) -> str:
+    """
+    Remplace les ${VARIABLE} d'une valeur balisée !ENV par les variables d'environnement.
+    
+    Args:
+        loader: Chargeur YAML en cours
+        noeud: Noeud scalaire balisé !ENV
+    
+    Returns:
+        Valeur avec les variables substituées (chaîne vide pour une variable non définie)
+    """
+    valeur = loader.construct_scalar(noeud)
+    return _VARIABLE_ENV_RE.sub(lambda m: os.getenv(m.group(1), ""), valeur)
+
+
+_ConfigLoader.add_constructor("!ENV", _construire_valeur_env)
+
 # Charger les variables d'environnement
 load_dotenv()
 
+# Listes d'exclusion de _est_entreprise_non_pertinente (correspondance par sous-chaîne)
+# Sites de grandes chaînes/groupes (accor, booking, etc.)
+_DOMAINES_EXCLUS = (
+    "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
+    "airbnb.com", "trivago.com", "agoda.com", "hotels.com",
+    "groupon.com", "uber.com", "deliveroo.com", "justeat.com"
+)
+# URLs avec des patterns suspects (sites génériques de groupes)
+_PATTERNS_URL_EXCLUS = (
+    "/restaurant-", "/hotel-", "/shop-", "/store-", "/location-",
+    ".accor.com", ".booking.", ".expedia.", ".tripadvisor.",
+    "/fr/restaurant", "/fr/hotel", "/en/restaurant", "/en/hotel"
+)
+# Immobilier
+_IMMOBILIER_EXCLUS = (
+    "immobilier", "real estate", "agence immobilière",
+    "homegate", "immoscout", "immoweb"
+)
+# Grandes chaînes/plateformes et leurs filiales (mais permettre les PME indépendantes)
+_GRANDES_ENTREPRISES = (
+    # Grandes surfaces suisses
+    "coop", "migros", "denner", "aldi", "lidl", "manor", "globus",
+    # E-commerce/Marketplaces
+    "galaxus", "digitec", "amazon", "booking", "trivago", "expedia",
+    "comparis", "ricardo", "anibis", "homegate", "immoscout", "immoweb",
+    # Grandes chaînes hôtels/restaurants/groups (mais permettre les petits hôtels/restaurants indépendants)
+    "accor", "expedia", "tripadvisor", "airbnb", "trivago", "hotels.com",
+    "marriott", "hilton", "hyatt", "novotel", "ibis", "mercure", "sofitel",
+    # Restauration rapide/Franchises
+    "mcdonald", "burger king", "kfc", "subway", "pizza hut", "domino",
+    "starbucks", "nespresso", "pret a manger",
+    # Mode/Grandes chaînes
+    "zara", "h&m", "mango", "bershka", "pull & bear", "stradivarius",
+    "c&a", "primark", "new look", "river island",
+    # Décoration/Meubles
+    "ikea", "conforama", "pfister", "micasa", "möbel pfister",
+    # Électronique
+    "media markt", "fnac", "saturn", "boulanger", "darty",
+    # Services bancaires/Télécom
+    "ubs", "credit suisse", "raiffeisen", "postfinance", "swisscom",
+    "sunrise", "orange", "salt", "telecom",
+    # Autres grandes marques
+    "nike", "adidas", "puma", "decathlon", "interdiscount", "interio",
+    # Médias (sites de presse)
+    "rts", "24heures", "lematin", "20min", "letemps", "tdg", "blick", "srf", "nzz",
+    # Indicateurs de filiales
+    "filiale", "succursale", "branch", "subsidiary"
+)
+# Gouvernemental/public
+_GOUVERNEMENTAL_EXCLUS = (
+    "ville-", "commune-", "administration",
+    "canton", "ge.ch", "admin.ch", ".gov"
+)
+# Sites médias (presse)
+_MEDIAS_EXCLUS = (
+    "rts.ch", "24heures.ch", "lematin.ch", "20min.ch",
+    "letemps.ch", "tdg.ch", "blick.ch", "srf.ch", "nzz.ch",
+    "rts", "24heures", "20 minutes"
+)
+
+
+_SITE_EXCLU_RE = compiler_alternatives(_DOMAINES_EXCLUS, _PATTERNS_URL_EXCLUS)
+_TEXTE_EXCLU_RE = compiler_alternatives(
+    _IMMOBILIER_EXCLUS, _GRANDES_ENTREPRISES, _GOUVERNEMENTAL_EXCLUS, _MEDIAS_EXCLUS
+)
+
+# Extensions de domaine reconnues par _detecter_pays_entreprise, dans l'ordre de priorité
+# (".qc.ca" avant ".ca" : l'alternative la plus longue doit être testée en premier)
+_PAYS_PAR_EXTENSION = (
+    (".qc.ca", "qc"), (".quebec", "qc"), (".ch", "ch"), (".fr", "fr"), (".ca", "ca"), (".be", "be"), (".lu", "lu"),
+)
+_EXTENSION_PAYS_RE = re.compile("|".join(re.escape(extension) for extension, _ in _PAYS_PAR_EXTENSION))
+_MOT_PAYS_RE = re.compile(r"québec|quebec|montréal|montreal|suisse|switzerland|france|canada")
+
+# Type d'entreprise -> template de message, dans l'ordre de priorité (artisan > commerce > B2B)
+_TYPES_TEMPLATE = (
+    ("artisan", "message_artisan", compiler_alternatives((
+        "plombier", "électricien", "maçon", "menuisier", "charpentier", "peintre", "chauffagiste", "artisan"
+    ))),
+    ("commerce", "message_commerce", compiler_alternatives((
+        "restaurant", "boutique", "commerce", "retail", "magasin", "épicerie", "boulangerie", "coiffeur", "salon"
+    ))),
+    ("B2B", "message_b2b", compiler_alternatives((
+        "cabinet", "fiduciaire", "consultant", "conseil", "avocat", "comptable", "agence", "bureau", "société"
+    ))),
+)
+
+# Schéma et "www." retirés d'une URL pour ne garder que le domaine (clé du cache des technologies)
+_PREFIXE_URL_RE = re.compile(r"^https?://(?:www\.)?")
+
+# Durée de validité du cache des APIs externes (en jours) : positive si l'API a trouvé quelque chose,
+# négative (plus courte) sinon, pour réessayer plus tôt les recherches infructueuses
+_DUREES_CACHE_API = {
+    "apollo": 7,
+    "hunter": 14,
+    "google_maps": 30,
+    "zerobounce": 30,
+    "serper_linkedin": 1,
+    "openai": 7,
+    "technologies": 30,
+}
+_DUREE_CACHE_NEGATIF = 1
+
+# Nombre d'ajouts de prospects entre deux recalculs complets des statistiques en base
+# (corrige l'écart dû aux modifications faites ailleurs, ex: interface web)
+_AJOUTS_ENTRE_RECALCULS_STATISTIQUES = 50
+
+# Longueur minimale (description + site web) pour qu'un appel OpenAI apporte plus que les textes par défaut
+_CONTEXTE_MIN_IA = 40
+
+
+def _correspond_exclusion(nom_lower: str, site_lower: str) -> bool:
+    """
+    Vérifie si une entreprise correspond à une des listes d'exclusion.
+    
+    Args:
+        nom_lower: Nom de l'entreprise en minuscules
+        site_lower: Site web de l'entreprise en minuscules
+    
+    Returns:
+        True si l'entreprise doit être exclue, False sinon
+    """
+    # Sites de grandes chaînes/groupes et URLs génériques : une seule recherche sur le site web
+    if _SITE_EXCLU_RE.search(site_lower):
+        return True
+    
+    # Immobilier, grandes chaînes, gouvernemental et médias : une seule recherche sur nom + site
+    return _TEXTE_EXCLU_RE.search(f"{nom_lower} {site_lower}") is not None
+
 
 class AgentProspection:
     """Agent de prospection B2B autonome."""
@@ -45,6 +218,12 @@ class AgentProspection:
         # Charger la configuration depuis YAML et variables d'environnement
         self.config = self._load_config(config_path)
         
+        # Nombre de prospects traités en parallèle (workers qui consomment la file d'attente)
+        try:
+            self.nombre_workers = max(1, int(self.config.get("workers", 4)))
+        except (ValueError, TypeError):
+            self.nombre_workers = 4
+        
         # Initialiser les clients API
         serper_key = os.getenv("SERPER_API_KEY")
         hunter_key = os.getenv("HUNTER_API_KEY")
@@ -56,27 +235,41 @@ class AgentProspection:
         if not all([serper_key, hunter_key, openai_key]):
             raise ValueError("Les clés API SERPER, HUNTER et OPENAI doivent être définies dans le fichier .env")
         
-        self.serper = SerperClient(serper_key)
-        self.hunter = HunterClient(hunter_key)
-        self.openai_client = OpenAIClient(openai_key)
+        # Quotas par minute des APIs (le débit est réglé par API, pas par une pause globale)
+        limites_api = self.config.get("limites_api") or {}
+        # Une seule session HTTP pour tous les clients : connexions TCP/TLS réutilisées entre APIs et workers
+        self.session_http = creer_session()
+        self.serper = SerperClient(serper_key, requetes_par_minute=limites_api.get("serper"), session=self.session_http)
+        self.hunter = HunterClient(hunter_key, requetes_par_minute=limites_api.get("hunter"), session=self.session_http)
+        # Un appel OpenAI possible par worker : les prospects en cours sont générés en parallèle
+        # (des requêtes séparées plutôt qu'un prompt groupé, dont la génération serait séquentielle)
+        self.openai_client = OpenAIClient(
+            openai_key,
+            model=self.config.get("modele_openai") or "gpt-4o-mini",
+            max_requetes_simultanees=self.nombre_workers,
+            requetes_par_minute=limites_api.get("openai"),
+            tokens_par_minute=limites_api.get("openai_tokens")
+        )
         
         # APIs optionnelles mais recommandées
         if apollo_key:
-            self.apollo = ApolloClient(apollo_key)
+            self.apollo = ApolloClient(apollo_key, requetes_par_minute=limites_api.get("apollo"), session=self.session_http)
             logger.info("✅ Apollo.io activé")
         else:
             self.apollo = None
             logger.warning("⚠️  Apollo.io non configuré (recommandé pour meilleurs résultats)")
         
         if google_maps_key:
-            self.google_maps = GoogleMapsClient(google_maps_key)
+            self.google_maps = GoogleMapsClient(google_maps_key, requetes_par_minute=limites_api.get("google_maps"), session=self.session_http)
             logger.info("✅ Google Maps activé")
         else:
             self.google_maps = None
             logger.info("ℹ️  Google Maps non configuré (optionnel)")
         
         if zerobounce_key:
-            self.zerobounce = ZeroBounceClient(zerobounce_key)
+            self.zerobounce = ZeroBounceClient(zerobounce_key, requetes_par_minute=limites_api.get("zerobounce"), session=self.session_http)
+            # Les vérifications demandées en même temps par les workers partent en une seule requête
+            self._verification_emails = VerificationEmailsGroupee(self.zerobounce)
             # Vérifier les crédits disponibles
             credits = self.zerobounce.obtenir_credits()
             # Conversion sécurisée en entier (double sécurité)
@@ -90,20 +283,62 @@ class AgentProspection:
                 logger.warning("⚠️  ZeroBounce activé mais aucun crédit disponible")
         else:
             self.zerobounce = None
+            self._verification_emails = None
             logger.info("ℹ️  ZeroBounce non configuré (optionnel pour vérification emails)")
         
         # Initialiser la base de données
         self.db = ProspectDatabase()
+        # Noms et sites déjà en base, gardés en mémoire : un candidat absent des deux est
+        # forcément nouveau, sans requête SQL (seuls les candidats connus sont confirmés en base)
+        self._noms_connus, self._sites_connus = self.db.obtenir_cles_prospects()
+        
+        # Statistiques affichées après chaque prospect : tenues à jour en mémoire à chaque ajout,
+        # recalculées en base seulement de temps en temps
+        self._statistiques = self.db.obtenir_statistiques()
+        self._ajouts_depuis_recalcul = 0
+        self._verrou_statistiques = threading.Lock()
+        
+        # Cache des réponses d'API : True (lecture + écriture), "rafraichir" (réponses existantes
+        # ignorées puis remplacées) ou False (désactivé)
+        self.mode_cache_api = self.config.get("cache_api", True)
+        entrees_expirees = self.db.purger_cache_api()
+        if entrees_expirees:
+            logger.info(f"🧹 {entrees_expirees} entrées expirées supprimées du cache des APIs")
         
         # File d'attente pour les prospects
         self.file_attente = Queue()
         
         # Configuration
-        self.intervalle_traitement = 2  # 2 secondes entre chaque traitement
+        self.intervalle_traitement = 2  # Pause (secondes) après une erreur de traitement
+        
+        # Pool de threads pour les appels d'enrichissement indépendants (Hunter, Google Maps, LinkedIn,
+        # technologies) : 4 appels simultanés possibles par prospect en cours de traitement
+        self._executor = ThreadPoolExecutor(max_workers=4 * self.nombre_workers, thread_name_prefix="enrichissement")
+        
+        # Les workers partagent la console et le compteur : un verrou évite les affichages entremêlés
+        self._verrou_affichage = threading.Lock()
+        # Sortie redirigée (cron, systemd, fichier) : résumé sur une ligne, sans couleurs ni cadres
+        self._affichage_riche = sys.stdout.isatty()
+        self._compteur = 0
+        
+        # Rechargement anticipé : les workers demandent de nouveaux prospects dès que la file
+        # passe sous le seuil, pendant qu'ils continuent à traiter ceux qui restent
+        self._seuil_rechargement = self.nombre_workers
+        self._demande_rechargement = threading.Event()
+        # Arrêt de l'agent sur erreur non récupérable (ex: clé OpenAI invalide) : sans lui, chaque
+        # prospect repayerait les APIs d'enrichissement avant d'échouer, puis serait remis en file
+        self._arret = threading.Event()
+        self._erreur_fatale: Optional[Exception] = None
+        # Prospects en file ou en cours de traitement (pas encore en base) : évite de les remettre en file
+        self._prospects_en_cours = set()
+        self._verrou_en_cours = threading.Lock()
         self.secteur_entreprise = self.config.get("secteur_entreprise", "Marketing Digital")
         self.service_propose = self.config.get("service_propose", "services digitaux")
         self.ville = self.config.get("ville", "Genève")
         self.pays = self.config.get("pays", "Suisse")
+        # Le filtre ne dépend que du nom, du site et du pays ciblé (fixe) : les mêmes résultats
+        # reviennent d'une recherche à l'autre, le verdict est mémorisé
+        self._est_entreprise_non_pertinente = functools.lru_cache(maxsize=8192)(self._est_entreprise_non_pertinente)
         self.message_base = self.config.get("message_base", "")
         # Templates multiples
         self.message_commerce = self.config.get("message_commerce", self.message_base)
@@ -114,7 +349,7 @@ class AgentProspection:
         
         # Initialiser le scoring et la détection de technologies
         self.scoring = ProspectScoring(service_propose=self.service_propose)
-        self.tech_detector = TechnologyDetector()
+        self.tech_detector = TechnologyDetector(session=self.session_http)
         
         # Charger les cibles depuis la config (types d'entreprises à cibler)
         self.cibles = self.config.get("cibles", [
@@ -130,6 +365,7 @@ class AgentProspection:
         logger.info(f"   Zone: {self.ville}, {self.pays}")
         logger.info(f"   Cibles: {', '.join(self.cibles)}")
         logger.info(f"   Nombre résultats: {self.nombre_resultats}")
+        logger.info(f"   Workers: {self.nombre_workers}")
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """
@@ -149,7 +385,7 @@ class AgentProspection:
         if os.path.exists(config_path):
             try:
                 with open(config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f) or {}
+                    config = yaml.load(f, Loader=_ConfigLoader) or {}
             except Exception as e:
                 logger.warning(f"⚠️  Impossible de charger {config_path}: {e}")
                 config = {}
@@ -157,45 +393,57 @@ class AgentProspection:
         # Surcharger avec les variables d'environnement Pterodactyl (si définies)
         # Les variables d'environnement ont la priorité
         
-        if os.getenv("SERVER_SECTEUR_ENTREPRISE"):
-            config["secteur_entreprise"] = os.getenv("SERVER_SECTEUR_ENTREPRISE")
-            logger.debug("✅ Secteur surchargé via SERVER_SECTEUR_ENTREPRISE")
-        
-        if os.getenv("SERVER_SERVICE_PROPOSE"):
-            config["service_propose"] = os.getenv("SERVER_SERVICE_PROPOSE")
-            logger.debug("✅ Service surchargé via SERVER_SERVICE_PROPOSE")
-        
-        if os.getenv("SERVER_VILLE"):
-            config["ville"] = os.getenv("SERVER_VILLE")
-            logger.debug("✅ Ville surchargée via SERVER_VILLE")
-        
-        if os.getenv("SERVER_PAYS"):
-            config["pays"] = os.getenv("SERVER_PAYS")
-            logger.debug("✅ Pays surchargé via SERVER_PAYS")
-        
-        if os.getenv("SERVER_PROPOSITION_VALEUR"):
-            config["proposition_valeur"] = os.getenv("SERVER_PROPOSITION_VALEUR")
-            logger.debug("✅ Proposition valeur surchargée via SERVER_PROPOSITION_VALEUR")
-        
-        if os.getenv("SERVER_NOMBRE_RESULTATS"):
-            try:
-                config["nombre_resultats_serper"] = int(os.getenv("SERVER_NOMBRE_RESULTATS"))
-                logger.debug("✅ Nombre résultats surchargé via SERVER_NOMBRE_RESULTATS")
-            except (ValueError, TypeError):
-                logger.warning(f"⚠️  SERVER_NOMBRE_RESULTATS invalide: {os.getenv('SERVER_NOMBRE_RESULTATS')}")
+        # Surcharges textuelles simples : (variable d'environnement, clé de config, message de log)
+        for variable, cle, message in (
+            ("SERVER_SECTEUR_ENTREPRISE", "secteur_entreprise", "Secteur surchargé"),
+            ("SERVER_SERVICE_PROPOSE", "service_propose", "Service surchargé"),
+            ("SERVER_VILLE", "ville", "Ville surchargée"),
+            ("SERVER_PAYS", "pays", "Pays surchargé"),
+            ("SERVER_PROPOSITION_VALEUR", "proposition_valeur", "Proposition valeur surchargée"),
+        ):
+            valeur = os.getenv(variable)
+            if valeur:
+                config[cle] = valeur
+                logger.debug(f"✅ {message} via {variable}")
+        
+        # Surcharges numériques
+        for variable, cle, message in (
+            ("SERVER_NOMBRE_RESULTATS", "nombre_resultats_serper", "Nombre résultats surchargé"),
+            ("SERVER_WORKERS", "workers", "Nombre de workers surchargé"),
+        ):
+            valeur = os.getenv(variable)
+            if valeur:
+                try:
+                    config[cle] = int(valeur)
+                    logger.debug(f"✅ {message} via {variable}")
+                except (ValueError, TypeError):
+                    logger.warning(f"⚠️  {variable} invalide: {valeur}")
+        
+        # Cache des APIs : "false"/"0"/"non" le désactive, "rafraichir" force le renouvellement
+        cache_api = os.getenv("SERVER_CACHE_API")
+        if cache_api:
+            cache_api = cache_api.strip().lower()
+            if cache_api in ("false", "0", "non", "off"):
+                config["cache_api"] = False
+            elif cache_api in ("rafraichir", "refresh"):
+                config["cache_api"] = "rafraichir"
+            else:
+                config["cache_api"] = True
+            logger.debug(f"✅ Cache des APIs surchargé via SERVER_CACHE_API ({config['cache_api']})")
         
         # Message base : gérer les retours à la ligne (\n -> vrais retours à la ligne)
-        if os.getenv("SERVER_MESSAGE_BASE"):
-            message_base = os.getenv("SERVER_MESSAGE_BASE").replace("\\n", "\n")
-            config["message_base"] = message_base
+        message_base = os.getenv("SERVER_MESSAGE_BASE")
+        if message_base:
+            config["message_base"] = message_base.replace("\\n", "\n")
             logger.debug("✅ Message base surchargé via SERVER_MESSAGE_BASE")
         
         # Cibles : parser le YAML depuis la variable d'environnement
-        if os.getenv("SERVER_CIBLES"):
-            cibles_str = os.getenv("SERVER_CIBLES").replace("\\n", "\n")
+        cibles_env = os.getenv("SERVER_CIBLES")
+        if cibles_env:
+            cibles_str = cibles_env.replace("\\n", "\n")
             try:
                 # Essayer de parser directement comme YAML (pour les listes complètes)
-                cibles_parsed = yaml.safe_load(cibles_str)
+                cibles_parsed = yaml.load(cibles_str, Loader=_YamlLoader)
                 if isinstance(cibles_parsed, list) and len(cibles_parsed) > 0:
                     config["cibles"] = cibles_parsed
                     logger.info(f"✅ Cibles surchargées via SERVER_CIBLES: {len(cibles_parsed)} items ({', '.join(cibles_parsed[:3])}{'...' if len(cibles_parsed) > 3 else ''})")
@@ -204,9 +452,7 @@ class AgentProspection:
             except Exception as e:
                 logger.warning(f"⚠️  Erreur lors du parsing YAML de SERVER_CIBLES: {e}")
                 # Fallback: essayer de parser comme une liste YAML formatée
-                cibles_str = os.getenv("SERVER_CIBLES", "").replace("\\n", "\n")
                 # Extraire les éléments entre guillemets (double ou simple)
-                import re
                 # Chercher tous les éléments entre guillemets
                 cibles_items = re.findall(r'"([^"]+)"|\'([^\']+)\'', cibles_str)
                 if cibles_items:
@@ -234,57 +480,106 @@ class AgentProspection:
     
     def charger_prospects_initiaux(self):
         """Charge une liste initiale de prospects qualifiés (PME privées locales)."""
-        from display_utils import print_section, print_info, Colors
         print_section("Recherche de prospects", width=100, icon="🔍", color=Colors.CYAN)
         logger.info(f"🎯 Recherche de prospects qualifiés (PME privées locales)")
         logger.info(f"   Service proposé: {self.service_propose}")
         logger.info(f"   Secteur: {self.secteur_entreprise}")
         logger.info(f"   Zone: {self.ville}, {self.pays}")
         
-        entreprises = []
+        # Les deux sources sont interrogées en parallèle : les résultats de la première qui répond
+        # sont filtrés et mis en file sans attendre la seconde
+        recherches = []
         
         # Méthode 1: Google Maps Places (prioritaire - trouve de vrais commerces locaux)
         if self.google_maps:
-            from display_utils import print_info, Colors
             print_info("📍 Source", "Google Maps Places (commerces locaux)", width=100, value_color=Colors.GREEN)
             logger.info("📍 Recherche via Google Maps Places (commerces locaux)...")
-            try:
-                commerces_gmaps = self.google_maps.rechercher_commerces_locaux(
-                    ville=self.ville,
-                    pays=self.pays,
-                    nombre_resultats=min(self.nombre_resultats, 10),  # Limiter à 10 pour éviter trop de requêtes
-                    cibles=self.cibles,  # Passer les cibles depuis la config
-                    service_propose=self.service_propose,  # Passer le service pour qualifier
-                    proposition_valeur=self.proposition_valeur  # Passer la proposition de valeur
-                )
-            except Exception as e:
-                logger.warning(f"Erreur lors de la recherche Google Maps: {e}")
-                commerces_gmaps = []
-            
-            # Convertir au format standard et filtrer
-            for commerce in commerces_gmaps:
-                nom = commerce.get("nom_entreprise", "")
-                site_web = commerce.get("site_web", "")
-                
-                # Filtrer les entreprises non pertinentes
-                if self._est_entreprise_non_pertinente(nom, site_web or ""):
-                    logger.debug(f"Entreprise Google Maps exclue: {nom} - {site_web}")
-                    continue
-                
-                entreprises.append({
-                    "nom_entreprise": nom,
-                    "site_web": site_web,
-                    "telephone": commerce.get("telephone"),
-                    "description": f"Commerce local - Note: {commerce.get('note', 'N/A')}",
-                    "source": "google_maps_places"
-                })
+            recherches.append(self._executor.submit(self._rechercher_google_maps))
         
         # Méthode 2: Serper (complémentaire)
-        from display_utils import print_info, Colors
         print_info("🔍 Source", "Serper.dev (recherche web complémentaire)", width=100, value_color=Colors.CYAN)
         logger.info("🔍 Recherche complémentaire via Serper...")
+        recherches.append(self._executor.submit(self._rechercher_serper))
+        
+        # Filtrer et nettoyer les résultats au fil de l'eau
+        nouvelles_entreprises = []
+        for recherche in as_completed(recherches):
+            candidats = {}
+            for entreprise in recherche.result():
+                site_web = entreprise.get("site_web") or ""  # S'assurer que ce n'est jamais None
+                nom = entreprise.get("nom_entreprise") or ""  # S'assurer que ce n'est jamais None
+                
+                # Filtres stricts : exclure grandes entreprises, immobilier, gouvernemental
+                if self._est_entreprise_non_pertinente(nom, site_web):
+                    logger.debug("Entreprise exclue (%s): %s - %s", entreprise.get("source", "serper"), nom, site_web)
+                    continue
+                
+                # Déjà en file ou en cours de traitement (pas encore sauvegardé en base), ou doublon du lot
+                cle_en_cours = (nom, site_web)
+                if cle_en_cours in self._prospects_en_cours or cle_en_cours in candidats:
+                    continue
+                candidats[cle_en_cours] = entreprise
+            
+            # Une seule vérification en base pour tout le lot
+            deja_en_base = self._prospects_connus(list(candidats))
+            for cle_en_cours, entreprise in candidats.items():
+                if cle_en_cours in deja_en_base:
+                    continue
+                nouvelles_entreprises.append(entreprise)
+                with self._verrou_en_cours:
+                    self._prospects_en_cours.add(cle_en_cours)
+                self.file_attente.put(entreprise)
+        
+        logger.info(f"✅ {len(nouvelles_entreprises)} nouvelles PME privées ajoutées à la file d'attente")
+        
+        # Ne pas afficher de message si aucun nouveau prospect (pour éviter le spam)
+        if len(nouvelles_entreprises) > 0:
+            with self._verrou_affichage:
+                print_success(f"{len(nouvelles_entreprises)} nouveaux prospects trouvés et ajoutés à la file d'attente !")
+        
+        return len(nouvelles_entreprises)
+    
+    def _rechercher_google_maps(self) -> List[Dict[str, Any]]:
+        """
+        Recherche des commerces locaux via Google Maps Places.
+        
+        Returns:
+            Liste des commerces au format standard (vide en cas d'erreur)
+        """
+        try:
+            commerces_gmaps = self.google_maps.rechercher_commerces_locaux(
+                ville=self.ville,
+                pays=self.pays,
+                nombre_resultats=min(self.nombre_resultats, 10),  # Limiter à 10 pour éviter trop de requêtes
+                cibles=self.cibles,  # Passer les cibles depuis la config
+                service_propose=self.service_propose,  # Passer le service pour qualifier
+                proposition_valeur=self.proposition_valeur  # Passer la proposition de valeur
+            )
+        except Exception as e:
+            logger.warning(f"Erreur lors de la recherche Google Maps: {e}")
+            return []
+        
+        # Convertir au format standard
+        return [
+            {
+                "nom_entreprise": commerce.get("nom_entreprise", ""),
+                "site_web": commerce.get("site_web", ""),
+                "telephone": commerce.get("telephone"),
+                "description": f"Commerce local - Note: {commerce.get('note', 'N/A')}",
+                "source": "google_maps_places"
+            }
+            for commerce in commerces_gmaps
+        ]
+    
+    def _rechercher_serper(self) -> List[Dict[str, Any]]:
+        """
+        Recherche des entreprises qualifiées via Serper.
+        
+        Returns:
+            Liste des entreprises trouvées (vide en cas d'erreur)
+        """
         try:
-            entreprises_serper = self.serper.rechercher_entreprises_qualifiees(
+            return self.serper.rechercher_entreprises_qualifiees(
                 service_propose=self.service_propose or "",
                 secteur_entreprise=self.secteur_entreprise or "",
                 ville=self.ville or "",
@@ -292,161 +587,77 @@ class AgentProspection:
                 nombre_resultats=self.nombre_resultats,
                 cibles=self.cibles,  # Passer les cibles depuis la config
                 proposition_valeur=self.proposition_valeur or ""  # Passer la proposition de valeur
-            )
-            if entreprises_serper:
-                entreprises.extend(entreprises_serper)
+            ) or []
         except Exception as e:
             logger.error(f"Erreur lors de la recherche Serper: {e}", exc_info=True)
             # Continuer même en cas d'erreur pour ne pas bloquer le processus
+            return []
+    
+    def _prospects_connus(self, cles: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        Détermine quels candidats existent déjà, en n'interrogeant la base que pour les candidats suspects.
         
-        # Filtrer et nettoyer les résultats
-        nouvelles_entreprises = []
-        for entreprise in entreprises:
-            site_web = entreprise.get("site_web") or ""  # S'assurer que ce n'est jamais None
-            nom = entreprise.get("nom_entreprise") or ""  # S'assurer que ce n'est jamais None
-            
-            # Filtres stricts : exclure grandes entreprises, immobilier, gouvernemental
-            if self._est_entreprise_non_pertinente(nom, site_web):
-                logger.debug(f"Entreprise exclue: {nom} - {site_web}")
-                continue
-            
-            if not self.db.prospect_existe(nom, site_web):
-                nouvelles_entreprises.append(entreprise)
-                self.file_attente.put(entreprise)
-        
-        logger.info(f"✅ {len(nouvelles_entreprises)} nouvelles PME privées ajoutées à la file d'attente")
-        
-        # Ne pas afficher de message si aucun nouveau prospect (pour éviter le spam)
-        if len(nouvelles_entreprises) > 0:
-            from display_utils import print_success
-            print_success(f"{len(nouvelles_entreprises)} nouveaux prospects trouvés et ajoutés à la file d'attente !")
+        Args:
+            cles: Liste de tuples (nom, site_web)
         
-        return len(nouvelles_entreprises)
+        Returns:
+            Ensemble des tuples (nom, site_web) déjà présents en base
+        """
+        # Un candidat dont ni le nom ni le site n'est connu en mémoire est forcément nouveau
+        suspects = [
+            (nom, site_web) for nom, site_web in cles
+            if nom in self._noms_connus or (site_web and site_web in self._sites_connus)
+        ]
+        return self.db.prospects_existent(suspects) if suspects else set()
     
     def _est_entreprise_non_pertinente(self, nom: str, site_web: str) -> bool:
         """Vérifie si une entreprise doit être exclue (grande entreprise, immobilier, sites génériques, etc.)."""
         nom_lower = (nom or "").lower()
         site_lower = (site_web or "").lower()
-        texte_complet = f"{nom_lower} {site_lower}"
         
         # FILTRE GÉOGRAPHIQUE DYNAMIQUE : Exclure seulement si le pays ne correspond pas
         if self.pays:
-            pays_resultat = self._detecter_pays_entreprise(nom, site_web)
+            pays_resultat = self._detecter_pays_entreprise(nom_lower, site_lower)
             if pays_resultat and not self._pays_correspond(self.pays, pays_resultat):
-                logger.debug(f"❌ Entreprise exclue (pays={pays_resultat} au lieu de {self.pays}): {nom} - {site_web}")
+                logger.debug("❌ Entreprise exclue (pays=%s au lieu de %s): %s - %s", pays_resultat, self.pays, nom, site_web)
                 return True
         
-        # Exclure les sites de grandes chaînes/groupes (accor, booking, etc.)
-        domaines_exclus = [
-            "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
-            "airbnb.com", "trivago.com", "agoda.com", "hotels.com",
-            "groupon.com", "uber.com", "deliveroo.com", "justeat.com"
-        ]
-        if any(domaine in site_lower for domaine in domaines_exclus):
-            return True
-        
-        # Exclure les URLs avec des patterns suspects (sites génériques de groupes)
-        patterns_exclus = [
-            "/restaurant-", "/hotel-", "/shop-", "/store-", "/location-",
-            ".accor.com", ".booking.", ".expedia.", ".tripadvisor.",
-            "/fr/restaurant", "/fr/hotel", "/en/restaurant", "/en/hotel"
-        ]
-        if any(pattern in site_lower for pattern in patterns_exclus):
-            return True
-        
-        # Exclure l'immobilier
-        if any(mot in texte_complet for mot in ["immobilier", "real estate", "agence immobilière", 
-                                                  "homegate", "immoscout", "immoweb"]):
-            return True
-        
-        # Exclure les grandes chaînes/plateformes et leurs filiales (mais permettre les PME indépendantes)
-        grandes_entreprises = [
-            # Grandes surfaces suisses
-            "coop", "migros", "denner", "aldi", "lidl", "manor", "globus",
-            # E-commerce/Marketplaces
-            "galaxus", "digitec", "amazon", "booking", "trivago", "expedia",
-            "comparis", "ricardo", "anibis", "homegate", "immoscout", "immoweb",
-            # Grandes chaînes hôtels/restaurants/groups (mais permettre les petits hôtels/restaurants indépendants)
-            "accor", "expedia", "tripadvisor", "airbnb", "trivago", "hotels.com",
-            "marriott", "hilton", "hyatt", "novotel", "ibis", "mercure", "sofitel",
-            # Restauration rapide/Franchises
-            "mcdonald", "burger king", "kfc", "subway", "pizza hut", "domino",
-            "starbucks", "nespresso", "pret a manger",
-            # Mode/Grandes chaînes
-            "zara", "h&m", "mango", "bershka", "pull & bear", "stradivarius",
-            "c&a", "primark", "new look", "river island",
-            # Décoration/Meubles
-            "ikea", "conforama", "pfister", "micasa", "möbel pfister",
-            # Électronique
-            "media markt", "fnac", "saturn", "boulanger", "darty",
-            # Services bancaires/Télécom
-            "ubs", "credit suisse", "raiffeisen", "postfinance", "swisscom",
-            "sunrise", "orange", "salt", "telecom",
-            # Autres grandes marques
-            "nike", "adidas", "puma", "decathlon", "interdiscount", "interio",
-            # Médias (sites de presse)
-            "rts", "24heures", "lematin", "20min", "letemps", "tdg", "blick", "srf", "nzz",
-            # Indicateurs de filiales
-            "filiale", "succursale", "branch", "subsidiary"
-        ]
-        if any(chain in texte_complet for chain in grandes_entreprises):
-            return True
-        
-        # Exclure gouvernemental/public
-        if any(mot in texte_complet for mot in ["ville-", "commune-", "administration", 
-                                                  "canton", "ge.ch", "admin.ch", ".gov"]):
-            return True
-        
-        # Exclure les sites médias (presse)
-        if any(mot in texte_complet for mot in ["rts.ch", "24heures.ch", "lematin.ch", "20min.ch", 
-                                                  "letemps.ch", "tdg.ch", "blick.ch", "srf.ch", "nzz.ch",
-                                                  "rts", "24heures", "20 minutes"]):
-            return True
-        
-        return False
+        # Listes d'exclusion
+        return _correspond_exclusion(nom_lower, site_lower)
     
-    def _detecter_pays_entreprise(self, nom: str, site_web: str) -> Optional[str]:
+    def _detecter_pays_entreprise(self, nom_lower: str, site_lower: str) -> Optional[str]:
         """
         Détecte le pays/région d'une entreprise à partir de son nom et site web.
         
         Args:
-            nom: Nom de l'entreprise
-            site_web: Site web de l'entreprise
+            nom_lower: Nom de l'entreprise (déjà en minuscules)
+            site_lower: Site web de l'entreprise (déjà en minuscules)
         
         Returns:
             Code pays normalisé (ex: "ch", "fr", "ca", "qc") ou None
         """
-        nom_safe = nom or ""
-        site_web_safe = site_web or ""
-        texte_complet = f"{nom_safe} {site_web_safe}".lower()
-        
-        # Vérifier le domaine du site web (le plus fiable)
-        if ".qc.ca" in site_web_safe.lower() or ".quebec" in site_web_safe.lower():
-            return "qc"
-        if ".ch" in site_web_safe.lower():
-            return "ch"
-        if ".fr" in site_web_safe.lower() and ".qc.ca" not in site_web_safe.lower():
-            return "fr"
-        if ".ca" in site_web_safe.lower() and ".qc.ca" not in site_web_safe.lower():
-            return "ca"
-        if ".be" in site_web_safe.lower():
-            return "be"
-        if ".lu" in site_web_safe.lower():
-            return "lu"
+        # Vérifier le domaine du site web (le plus fiable), par ordre de priorité des extensions
+        extensions = set(_EXTENSION_PAYS_RE.findall(site_lower))
+        if extensions:
+            for extension, code in _PAYS_PAR_EXTENSION:
+                if extension in extensions:
+                    return code
         
         # Vérifier les mots-clés géographiques
-        if "québec" in texte_complet or "quebec" in texte_complet:
-            if "montréal" in texte_complet or "montreal" in texte_complet:
-                return "qc"
-            if "canada" in texte_complet:
-                return "qc"
-        if ("montréal" in texte_complet or "montreal" in texte_complet) and "canada" in texte_complet:
+        mots = set(_MOT_PAYS_RE.findall(f"{nom_lower} {site_lower}"))
+        if not mots:
+            return None
+        quebec = "québec" in mots or "quebec" in mots
+        montreal = "montréal" in mots or "montreal" in mots
+        canada = "canada" in mots
+        
+        if (quebec and (montreal or canada)) or (montreal and canada):
             return "qc"
-        if "suisse" in texte_complet or "switzerland" in texte_complet:
+        if "suisse" in mots or "switzerland" in mots:
             return "ch"
-        if "france" in texte_complet and "quebec" not in texte_complet:
+        if "france" in mots and "quebec" not in mots:
             return "fr"
-        if "canada" in texte_complet and "québec" not in texte_complet and "quebec" not in texte_complet:
+        if canada and not quebec:
             return "ca"
         
         return None
@@ -537,7 +748,9 @@ class AgentProspection:
         # 1.1. Apollo.io (priorité - meilleur taux de succès)
         if self.apollo and (prospect_complet.get("site_web") or prospect_complet["nom_entreprise"]):
             logger.info(f"Recherche Apollo.io pour {prospect_complet['nom_entreprise']}")
-            entreprise_apollo, _ = self.apollo.rechercher_entreprise_et_dirigeant(
+            entreprise_apollo, _ = self._appel_avec_cache(
+                "apollo",
+                self.apollo.rechercher_entreprise_et_dirigeant,
                 prospect_complet["nom_entreprise"],
                 prospect_complet.get("site_web", ""),
                 self.ville
@@ -555,25 +768,43 @@ class AgentProspection:
                 if entreprise_apollo.get("site_web") and not prospect_complet.get("site_web"):
                     prospect_complet["site_web"] = entreprise_apollo["site_web"]
         
-        # 1.2. Hunter.io (fallback si Apollo n'a pas trouvé)
-        if not email_trouve and prospect_complet.get("site_web"):
+        # Hunter.io et Google Maps ne dépendent que du résultat d'Apollo : on les lance en parallèle
+        # pour ne payer que la latence de l'appel le plus lent
+        site_web_apollo = prospect_complet.get("site_web")
+        future_hunter = None
+        future_gmaps = None
+        
+        if not email_trouve and site_web_apollo:
             logger.info(f"Recherche Hunter.io pour {prospect_complet['nom_entreprise']}")
-            email_hunter, _ = self.hunter.trouver_email_dirigeant(
-                prospect_complet["site_web"],
+            future_hunter = self._executor.submit(
+                self._appel_avec_cache,
+                "hunter",
+                self.hunter.trouver_email_dirigeant,
+                site_web_apollo,
                 prospect_complet["nom_entreprise"]
             )
-            
-            if email_hunter:
-                email_trouve = email_hunter
         
-        # 1.3. Google Maps (pour téléphone vérifié si manquant)
         if self.google_maps and not telephone_trouve:
             logger.info(f"Recherche Google Maps pour {prospect_complet['nom_entreprise']}")
-            entreprise_gmaps = self.google_maps.rechercher_entreprise_locale(
+            future_gmaps = self._executor.submit(
+                self._appel_avec_cache,
+                "google_maps",
+                self.google_maps.rechercher_entreprise_locale,
                 prospect_complet["nom_entreprise"],
                 self.ville,
                 self.pays
             )
+        
+        # 1.2. Hunter.io (fallback si Apollo n'a pas trouvé)
+        if future_hunter:
+            email_hunter, _ = future_hunter.result()
+            
+            if email_hunter:
+                email_trouve = email_hunter
+        
+        # 1.3. Google Maps (pour téléphone vérifié si manquant)
+        if future_gmaps:
+            entreprise_gmaps = future_gmaps.result()
             
             if entreprise_gmaps:
                 if entreprise_gmaps.get("telephone") and not telephone_trouve:
@@ -592,11 +823,39 @@ class AgentProspection:
         prospect_complet["email"] = email_trouve
         prospect_complet["telephone"] = telephone_trouve or prospect_complet.get("telephone")
         
+        # 1.4. Validation : s'assurer qu'il y a au moins email OU téléphone (les étapes suivantes n'en
+        # trouvent pas) avant de payer ZeroBounce et OpenAI pour un prospect qui serait ignoré
+        if not prospect_complet["email"] and not prospect_complet["telephone"]:
+            logger.warning(f"❌ Prospect {prospect_complet['nom_entreprise']} ignoré : aucun email ni téléphone trouvé")
+            return None
+        
+        # La recherche LinkedIn (Serper, payante) et la détection des technologies ne sont lancées que
+        # pour un prospect conservé, avec le site complété par Google Maps ; elles tournent pendant
+        # la vérification ZeroBounce
+        future_linkedin = None
+        future_technologies = None
+        site_web = prospect_complet.get("site_web")
+        
+        # Recherche LinkedIn via Serper (seulement si pas déjà trouvé par Apollo)
+        if not prospect_complet.get("linkedin_entreprise") and prospect_complet["nom_entreprise"]:
+            future_linkedin = self._executor.submit(
+                self._appel_avec_cache,
+                "serper_linkedin",
+                self.serper.rechercher_linkedin,
+                prospect_complet["nom_entreprise"],
+                site_web or "",
+                self.ville
+            )
+        
+        # Téléchargement du site pour la détection des technologies (étape 2)
+        if site_web:
+            future_technologies = self._executor.submit(self._detecter_technologies, site_web)
+        
         # 1.5. Vérification de l'email avec ZeroBounce (si email trouvé)
         if email_trouve and self.zerobounce:
             try:
                 logger.info(f"Vérification ZeroBounce pour {email_trouve}")
-                verification = self.zerobounce.verifier_email(email_trouve)
+                verification = self._appel_avec_cache("zerobounce", self._verification_emails.verifier_email, email_trouve)
                 
                 # S'assurer que le statut n'est jamais None
                 status = verification.get("status") or "unknown"
@@ -622,7 +881,7 @@ class AgentProspection:
                 elif status != "unknown":
                     logger.warning(f"⚠️ Statut email: {status} pour {email_trouve}")
                 else:
-                    logger.debug(f"Statut email inconnu pour {email_trouve}")
+                    logger.debug("Statut email inconnu pour %s", email_trouve)
                     
             except Exception as e:
                 logger.warning(f"Erreur lors de la vérification ZeroBounce: {e}")
@@ -642,26 +901,24 @@ class AgentProspection:
             if donnees_entreprise.get("revenue"):
                 prospect_complet["revenue_estime"] = donnees_entreprise["revenue"]
         
-        # 2. Détection des technologies web utilisées
-        site_web = prospect_complet.get("site_web", "")
-        if site_web:
+        # 2. Détection des technologies web utilisées (lancée en parallèle plus haut)
+        if future_technologies:
             try:
                 logger.info(f"Détection des technologies pour {site_web}")
-                technologies = self.tech_detector.detecter(site_web)
+                technologies = future_technologies.result()
                 prospect_complet["technologies"] = ",".join(technologies) if technologies else ""
+                # Liste gardée telle quelle pour le scoring et l'affichage (la chaîne sert à la base)
+                prospect_complet["technologies_liste"] = technologies
                 if technologies:
                     logger.info(f"✅ Technologies détectées: {', '.join(technologies)}")
             except Exception as e:
-                logger.debug(f"Erreur lors de la détection de technologies: {e}")
+                logger.debug("Erreur lors de la détection de technologies: %s", e)
                 prospect_complet["technologies"] = ""
+                prospect_complet["technologies_liste"] = []
         
-        # 3. Recherche LinkedIn via Serper (seulement si pas déjà trouvé par Apollo)
-        if not prospect_complet.get("linkedin_entreprise") and prospect_complet["nom_entreprise"]:
-            linkedin_entreprise = self.serper.rechercher_linkedin(
-                prospect_complet["nom_entreprise"],
-                prospect_complet.get("site_web", ""),
-                self.ville
-            )
+        # 3. Recherche LinkedIn via Serper (lancée en parallèle plus haut)
+        if future_linkedin:
+            linkedin_entreprise = future_linkedin.result()
             if linkedin_entreprise:
                 prospect_complet["linkedin_entreprise"] = linkedin_entreprise
         
@@ -675,69 +932,164 @@ class AgentProspection:
             logger.warning(f"Erreur lors du calcul du score: {e}")
             prospect_complet["score"] = 0
         
-        # 5. Analyse de pertinence avec OpenAI (pourquoi cette entreprise et ce qu'on peut leur proposer)
-        try:
-            analyse_pertinence = self.openai_client.analyser_entreprise_pertinence(
-                prospect_complet,
-                self.service_propose,
-                self.secteur_entreprise
-            )
-            prospect_complet["raison_choix"] = analyse_pertinence.get("raison_choix", "")
-            prospect_complet["proposition_service"] = analyse_pertinence.get("proposition_service", "")
-            logger.info(f"✅ Analyse de pertinence générée pour {prospect_complet['nom_entreprise']}")
-        except Exception as e:
-            logger.warning(f"Erreur lors de l'analyse de pertinence pour {prospect_complet['nom_entreprise']}: {e}")
-            prospect_complet["raison_choix"] = f"PME locale qui pourrait bénéficier de {self.service_propose}"
-            prospect_complet["proposition_service"] = f"Amélioration de leur présence digitale avec {self.service_propose}"
-        
-        # 6. Sélection du template de message selon le type d'entreprise
+        # 5. Sélection du template de message selon le type d'entreprise
         template_a_utiliser = self._selectionner_template_message(prospect_complet)
         prospect_complet["template_utilise"] = template_a_utiliser
         
-        # 7. Génération du message personnalisé avec OpenAI
+        # 6. Analyse de pertinence (pourquoi cette entreprise et ce qu'on peut leur proposer)
+        # et génération du message personnalisé en un seul appel OpenAI
         # On génère toujours un message, même sans dirigeant (utilise "Monsieur/Madame" par défaut)
-        try:
-            resultat_ia = self.openai_client.generer_message_personnalise(
-                prospect_complet,
-                template_a_utiliser,
-                self.proposition_valeur,
-                service_propose=self.service_propose,
-                secteur_entreprise=self.secteur_entreprise
-            )
-            prospect_complet["message_personnalise"] = resultat_ia.get("message_personnalise", "")
-            prospect_complet["point_specifique"] = resultat_ia.get("point_specifique", "")
-        except Exception as e:
-            logger.warning(f"Erreur lors de la génération du message pour {prospect_complet['nom_entreprise']}: {e}")
-            # Message par défaut sans IA
-            prospect_complet["message_personnalise"] = template_a_utiliser.replace(
-                "{nom_dirigeant}", "Monsieur/Madame"
-            ).replace(
-                "{nom_entreprise}", prospect_complet["nom_entreprise"]
-            ).replace(
-                "{point_specifique}", "votre expertise"
-            ).replace(
-                "{proposition_valeur}", self.proposition_valeur
-            )
-            prospect_complet["point_specifique"] = "expertise dans votre domaine"
-        
-        # 5. Validation : s'assurer qu'il y a au moins email OU téléphone
-        email = prospect_complet.get("email")
-        telephone = prospect_complet.get("telephone")
-        
-        if not email and not telephone:
-            logger.warning(f"❌ Prospect {prospect_complet['nom_entreprise']} ignoré : aucun email ni téléphone trouvé")
-            return None
-        
-        # 6. Sauvegarde en base de données
+        # Sans site web ni description exploitable, l'IA n'aurait que le nom de l'entreprise :
+        # les textes par défaut sont utilisés sans payer l'appel
+        contexte_ia = (prospect_complet.get("description") or "") + (prospect_complet.get("site_web") or "")
+        if len(contexte_ia.strip()) < _CONTEXTE_MIN_IA:
+            logger.info(f"ℹ️  Données insuffisantes pour l'IA, textes par défaut pour {prospect_complet['nom_entreprise']}")
+            self._appliquer_textes_par_defaut(prospect_complet, template_a_utiliser)
+        else:
+            try:
+                # Mise en cache sur l'ensemble des données du prompt : un prospect retraité avec les mêmes
+                # données (ex: re-trouvé lors d'une recherche suivante) ne repaie pas l'appel OpenAI
+                cle_ia = hashlib.sha1(json.dumps(
+                    [prospect_complet, template_a_utiliser, self.proposition_valeur,
+                     self.service_propose, self.secteur_entreprise, self.openai_client.model],
+                    sort_keys=True, ensure_ascii=False, default=str
+                ).encode("utf-8")).hexdigest()
+                resultat_ia = self._appel_avec_cache(
+                    "openai",
+                    self.openai_client.analyser_et_generer,
+                    prospect_complet,
+                    template_a_utiliser,
+                    self.proposition_valeur,
+                    self.service_propose,
+                    self.secteur_entreprise,
+                    cle=cle_ia
+                )
+                prospect_complet["raison_choix"] = resultat_ia.get("raison_choix", "")
+                prospect_complet["proposition_service"] = resultat_ia.get("proposition_service", "")
+                prospect_complet["message_personnalise"] = resultat_ia.get("message_personnalise", "")
+                prospect_complet["point_specifique"] = resultat_ia.get("point_specifique", "")
+                logger.info(f"✅ Analyse de pertinence et message générés pour {prospect_complet['nom_entreprise']}")
+            except ERREURS_CONFIGURATION:
+                # Clé ou modèle OpenAI invalide : ne pas sauvegarder le prospect avec les textes par défaut
+                raise
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'analyse et de la génération du message pour {prospect_complet['nom_entreprise']}: {e}")
+                self._appliquer_textes_par_defaut(prospect_complet, template_a_utiliser)
+            
+        # 7. Sauvegarde en base de données
         prospect_id = self.db.ajouter_prospect(prospect_complet)
         
         if prospect_id:
             logger.info(f"✅ Prospect sauvegardé avec l'ID: {prospect_id}")
+            self._noms_connus.add(prospect_complet["nom_entreprise"])
+            if prospect_complet.get("site_web"):
+                self._sites_connus.add(prospect_complet["site_web"])
+            self._compter_prospect_ajoute(prospect_complet)
         else:
             logger.warning(f"⚠️ Le prospect {prospect_complet['nom_entreprise']} n'a pas pu être sauvegardé")
         
         return prospect_complet
     
+    def _appliquer_textes_par_defaut(self, prospect: Dict[str, Any], template: str):
+        """
+        Remplit l'analyse et le message du prospect avec les textes par défaut (sans IA).
+        
+        Args:
+            prospect: Prospect en cours de traitement (modifié en place)
+            template: Template de message sélectionné pour le prospect
+        """
+        prospect["raison_choix"] = f"PME locale qui pourrait bénéficier de {self.service_propose}"
+        prospect["proposition_service"] = f"Amélioration de leur présence digitale avec {self.service_propose}"
+        prospect["message_personnalise"] = message_par_defaut(
+            template, prospect["nom_entreprise"], self.proposition_valeur
+        )
+        prospect["point_specifique"] = "expertise dans votre domaine"
+    
+    def _compter_prospect_ajoute(self, prospect: Dict[str, Any]):
+        """
+        Met à jour les statistiques en mémoire après l'ajout d'un prospect en base.
+        
+        Args:
+            prospect: Prospect qui vient d'être sauvegardé (statut 'traite')
+        """
+        with self._verrou_statistiques:
+            self._ajouts_depuis_recalcul += 1
+            if self._ajouts_depuis_recalcul >= _AJOUTS_ENTRE_RECALCULS_STATISTIQUES:
+                self._statistiques = self.db.obtenir_statistiques()
+                self._ajouts_depuis_recalcul = 0
+                return
+            self._statistiques['total'] += 1
+            self._statistiques['traites'] += 1
+            if prospect.get("email"):
+                self._statistiques['avec_email'] += 1
+    
+    def _statistiques_courantes(self) -> Dict[str, int]:
+        """
+        Retourne une copie des statistiques tenues à jour en mémoire.
+        
+        Returns:
+            Dictionnaire avec les statistiques (total, avec_email, traites)
+        """
+        with self._verrou_statistiques:
+            return dict(self._statistiques)
+    
+    def _detecter_technologies(self, site_web: str) -> List[str]:
+        """
+        Détecte les technologies d'un site, en cache par domaine (la pile technique change rarement).
+        
+        Args:
+            site_web: URL du site web
+        
+        Returns:
+            Liste des technologies détectées
+        """
+        domaine = _PREFIXE_URL_RE.sub("", site_web.strip().lower()).split("/")[0]
+        return list(self._appel_avec_cache("technologies", self.tech_detector.detecter, site_web, cle=domaine) or [])
+    
+    def _appel_avec_cache(self, source: str, fonction, *args, cle: Optional[str] = None):
+        """
+        Appelle une API externe en passant par le cache persistant de la base de données.
+        
+        Args:
+            source: Nom de l'API (clé de _DUREES_CACHE_API)
+            fonction: Méthode du client à appeler en cas d'absence dans le cache
+            *args: Arguments de la méthode (servent aussi de clé de cache, normalisés)
+            cle: Clé de cache explicite, pour les arguments trop volumineux pour servir de clé
+        
+        Returns:
+            Résultat de l'API (depuis le cache ou depuis l'appel)
+        """
+        if not self.mode_cache_api:
+            return fonction(*args)
+        
+        if cle is None:
+            cle = "|".join(str(arg or "").strip().lower() for arg in args)
+        
+        if self.mode_cache_api != "rafraichir":
+            trouve, valeur = self.db.lire_cache_api(source, cle)
+            if trouve:
+                logger.debug("💾 Cache %s utilisé pour %s", source, cle)
+                # JSON ne connaît pas les tuples : restaurer la forme (a, b) des clients qui en renvoient
+                return tuple(valeur) if isinstance(valeur, list) else valeur
+        
+        resultat = fonction(*args)
+        
+        # Appel en échec remplacé par des valeurs par défaut (OpenAI) : ne pas le mettre en cache
+        if isinstance(resultat, dict) and resultat.get("erreur"):
+            return resultat
+        
+        # Résultat négatif : rien trouvé (None, (None, None)) ou vérification d'email non concluante
+        if isinstance(resultat, tuple):
+            negatif = not any(resultat)
+        elif isinstance(resultat, dict) and source == "zerobounce":
+            negatif = resultat.get("status", "unknown") == "unknown"
+        else:
+            negatif = not resultat
+        duree_jours = _DUREE_CACHE_NEGATIF if negatif else _DUREES_CACHE_API.get(source, _DUREE_CACHE_NEGATIF)
+        self.db.enregistrer_cache_api(source, cle, resultat, duree_jours * 86400)
+        
+        return resultat
+    
     def _selectionner_template_message(self, prospect: Dict[str, Any]) -> str:
         """
         Sélectionne le template de message approprié selon le type d'entreprise.
@@ -748,32 +1100,21 @@ class AgentProspection:
         Returns:
             Template de message à utiliser
         """
-        nom = (prospect.get("nom_entreprise") or "").lower()
-        industrie = (prospect.get("industrie") or "").lower()
-        description = (prospect.get("description") or "").lower()
-        technologies = (prospect.get("technologies") or "").lower()
-        
-        # Détecter le type d'entreprise
-        commerce_keywords = ["restaurant", "boutique", "commerce", "retail", "magasin", "épicerie", "boulangerie", "coiffeur", "salon"]
-        artisan_keywords = ["plombier", "électricien", "maçon", "menuisier", "charpentier", "peintre", "chauffagiste", "artisan"]
-        b2b_keywords = ["cabinet", "fiduciaire", "consultant", "conseil", "avocat", "comptable", "agence", "bureau", "société"]
+        nom = prospect.get("nom_entreprise") or ""
+        industrie = prospect.get("industrie") or ""
+        description = prospect.get("description") or ""
         
-        # Vérifier dans différents champs
+        # Détecter le type d'entreprise dans les différents champs (une recherche compilée par type)
         texte_complet = f"{nom} {industrie} {description}".lower()
         
-        if any(mot in texte_complet for mot in artisan_keywords):
-            logger.debug(f"Template artisan sélectionné pour {prospect.get('nom_entreprise')}")
-            return self.message_artisan
-        elif any(mot in texte_complet for mot in commerce_keywords):
-            logger.debug(f"Template commerce sélectionné pour {prospect.get('nom_entreprise')}")
-            return self.message_commerce
-        elif any(mot in texte_complet for mot in b2b_keywords):
-            logger.debug(f"Template B2B sélectionné pour {prospect.get('nom_entreprise')}")
-            return self.message_b2b
-        else:
-            # Template par défaut
-            logger.debug(f"Template base sélectionné pour {prospect.get('nom_entreprise')}")
-            return self.message_base
+        for type_entreprise, attribut_template, mots_cles_re in _TYPES_TEMPLATE:
+            if mots_cles_re.search(texte_complet):
+                logger.debug("Template %s sélectionné pour %s", type_entreprise, nom)
+                return getattr(self, attribut_template)
+        
+        # Template par défaut
+        logger.debug("Template base sélectionné pour %s", nom)
+        return self.message_base
     
     def afficher_resume(self, prospect: Dict[str, Any]):
         """
@@ -782,18 +1123,16 @@ class AgentProspection:
         Args:
             prospect: Dictionnaire contenant les données du prospect
         """
-        from display_utils import (
-            print_header, print_section, print_info, print_box, 
-            print_separator, wrap_text, Colors, print_success, print_warning
-        )
-        
         nom_entreprise = prospect.get('nom_entreprise', 'N/A')
         score = prospect.get('score', 0)
         
         # Afficher le score dans l'en-tête
-        from scoring import ProspectScoring
-        scoring_temp = ProspectScoring(self.service_propose)
-        categorie = scoring_temp.obtenir_categorie_score(score)
+        categorie = self.scoring.obtenir_categorie_score(score)
+        
+        if not self._affichage_riche:
+            print(f"{nom_entreprise} | score={score} ({categorie}) | email={prospect.get('email') or 'N/A'} "
+                  f"| téléphone={prospect.get('telephone') or 'N/A'} | site={prospect.get('site_web') or 'N/A'}")
+            return
         
         # En-tête principal simplifié avec score
         print_header(f"📊 {nom_entreprise} - Score: {score}/100 ({categorie})", width=100, color=Colors.CYAN)
@@ -880,10 +1219,9 @@ class AgentProspection:
             print_box(proposition_service, width=100, border_color=Colors.YELLOW)
         
         # Technologies détectées
-        technologies = prospect.get('technologies', '')
+        technologies = prospect.get('technologies_liste')
         if technologies:
-            techs_list = technologies.split(',')
-            print_info("🔧 Technologies", ', '.join(techs_list[:5]), width=100, value_color=Colors.CYAN)
+            print_info("🔧 Technologies", ', '.join(technologies[:5]), width=100, value_color=Colors.CYAN)
         
         # Point spécifique
         point_specifique = prospect.get('point_specifique', 'N/A')
@@ -907,64 +1245,110 @@ class AgentProspection:
     
     def lancer(self):
         """Lance la boucle principale de l'agent."""
-        from display_utils import print_header, print_info, print_separator, Colors, print_success
-        
         # En-tête de démarrage visuel simplifié
         print_header("🚀 Agent de Prospection B2B", width=100, color=Colors.CYAN)
         print_info("Service", self.service_propose, width=100, value_color=Colors.GREEN)
         print_info("Zone", f"{self.ville}, {self.pays}", width=100)
-        print_info("Intervalle", f"{self.intervalle_traitement}s", width=100)
+        print_info("Pause après erreur", f"{self.intervalle_traitement}s", width=100)
+        print_info("Workers", str(self.nombre_workers), width=100)
         print()
         
         logger.info("🚀 Démarrage de l'agent de prospection B2B")
-        logger.info(f"⏱️  Intervalle de traitement: {self.intervalle_traitement} secondes ({self.intervalle_traitement//60} minutes)")
+        logger.info(f"⏱️  Pause après erreur: {self.intervalle_traitement} secondes (débit réglé par les quotas des APIs)")
         logger.info(f"🎯 Service proposé: {self.service_propose}")
         logger.info(f"📊 Secteur: {self.secteur_entreprise} | Zone: {self.ville}, {self.pays}")
         
+        # Démarrer les workers avant la recherche initiale : chacun consomme la file d'attente et traite
+        # un prospect à la fois, dès que la source la plus rapide a répondu (sans attendre les autres)
+        for i in range(self.nombre_workers):
+            threading.Thread(
+                target=self._boucle_worker,
+                name=f"worker-{i + 1}",
+                daemon=True
+            ).start()
+        logger.info(f"👷 {self.nombre_workers} worker(s) démarré(s)")
+        
         # Charger les prospects initiaux
+        nouveaux = 0
         try:
-            self.charger_prospects_initiaux()
+            nouveaux = self.charger_prospects_initiaux()
         except Exception as e:
             logger.error(f"❌ Erreur lors du chargement des prospects initiaux: {e}", exc_info=True)
             logger.warning("⚠️  Continuation avec les prospects déjà existants dans la base de données...")
         
-        if self.file_attente.empty():
+        if self._arret.is_set():
+            raise self._erreur_fatale
+        
+        if nouveaux == 0 and self.file_attente.empty():
             logger.warning("⚠️  Aucun nouveau prospect trouvé. Relancez une recherche ou vérifiez la configuration.")
             # Ne pas arrêter complètement - continuer avec les prospects existants
             logger.info("ℹ️  L'agent continuera de fonctionner et tentera de charger de nouveaux prospects plus tard.")
             return
         
+        # Les workers ont pu vider la file pendant l'arrivée des premiers résultats : ne garder la
+        # demande de rechargement que si la file est encore sous le seuil une fois la recherche finie
+        if self.file_attente.qsize() >= self._seuil_rechargement:
+            self._demande_rechargement.clear()
+        
         # Afficher les statistiques initiales
-        stats = self.db.obtenir_statistiques()
-        from display_utils import print_success
-        print_success(f"Statistiques initiales - Total: {stats['total']} prospects | Avec email: {stats['avec_email']}")
+        stats = self._statistiques_courantes()
+        with self._verrou_affichage:
+            print_success(f"Statistiques initiales - Total: {stats['total']} prospects | Avec email: {stats['avec_email']}")
         
-        # Boucle principale
-        compteur = 0
+        # Boucle principale : recharger la file d'attente dès qu'elle passe sous le seuil,
+        # sans attendre qu'elle soit vide (les workers continuent pendant la recherche)
         tentatives_echouees = 0
         while True:
             try:
-                if self.file_attente.empty():
-                    logger.debug("📭 File d'attente vide. Chargement de nouveaux prospects...")
-                    nouveaux = self.charger_prospects_initiaux()
-                    
-                    if nouveaux == 0:
-                        tentatives_echouees += 1
-                        # Afficher un message seulement toutes les 5 tentatives pour éviter le spam
-                        if tentatives_echouees % 5 == 1:
-                            logger.debug(f"⏳ Aucun nouveau prospect trouvé (tentative {tentatives_echouees}). Recherche en cours...")
-                        time.sleep(60)  # Attendre 1 minute
-                        continue
-                    else:
-                        # Réinitialiser le compteur si on trouve des prospects
-                        tentatives_echouees = 0
+                self._demande_rechargement.wait()
+                self._demande_rechargement.clear()
+                if self._arret.is_set():
+                    break
                 
-                # Récupérer le prochain prospect
-                entreprise = self.file_attente.get()
-                compteur += 1
+                logger.debug("📭 File d'attente presque vide (%d restants). Chargement de nouveaux prospects...", self.file_attente.qsize())
+                nouveaux = self.charger_prospects_initiaux()
                 
-                from display_utils import print_section, Colors
-                print_section(f"Prospect #{compteur}", width=100, icon="🔄", color=Colors.BLUE)
+                if nouveaux == 0:
+                    tentatives_echouees += 1
+                    # Afficher un message seulement toutes les 5 tentatives pour éviter le spam
+                    if tentatives_echouees % 5 == 1:
+                        logger.debug("⏳ Aucun nouveau prospect trouvé (tentative %d). Recherche en cours...", tentatives_echouees)
+                    # Attendre 1 minute (interrompue si l'agent doit s'arrêter)
+                    if self._arret.wait(60):
+                        break
+                    # Réessayer ensuite (les workers inactifs ne redemanderont pas de rechargement)
+                    self._demande_rechargement.set()
+                else:
+                    # Réinitialiser le compteur si on trouve des prospects
+                    tentatives_echouees = 0
+                
+            except KeyboardInterrupt:
+                logger.info("\n⏹️  Arrêt demandé par l'utilisateur")
+                break
+            except Exception as e:
+                logger.error(f"❌ Erreur lors du chargement de nouveaux prospects: {e}", exc_info=True)
+                logger.info(f"⏳ Attente de {self.intervalle_traitement} secondes avant nouvelle tentative...")
+                time.sleep(self.intervalle_traitement)
+        
+        if self._erreur_fatale is not None:
+            raise self._erreur_fatale
+    
+    def _boucle_worker(self):
+        """Boucle d'un worker : récupère les prospects de la file d'attente et les traite un par un."""
+        while True:
+            entreprise = self.file_attente.get()
+            # Demander un rechargement anticipé si la file passe sous le seuil
+            if self.file_attente.qsize() < self._seuil_rechargement:
+                self._demande_rechargement.set()
+            try:
+                # Agent arrêté : vider la file sans payer les APIs pour les prospects restants
+                if self._arret.is_set():
+                    continue
+                
+                with self._verrou_affichage:
+                    self._compteur += 1
+                    compteur = self._compteur
+                    print_section(f"Prospect #{compteur}", width=100, icon="🔄", color=Colors.BLUE)
                 logger.info(f"\n🔄 Traitement du prospect #{compteur}")
                 
                 # Traiter le prospect
@@ -972,34 +1356,37 @@ class AgentProspection:
                 
                 # Si le prospect n'a pas pu être traité (pas d'email ni téléphone), passer au suivant
                 if prospect_traite is None:
-                    from display_utils import print_warning
-                    print_warning(f"Prospect #{compteur} ignoré (pas de contact valide). Passage au suivant...")
+                    with self._verrou_affichage:
+                        print_warning(f"Prospect #{compteur} ignoré (pas de contact valide). Passage au suivant...")
                     logger.info("⏭️  Prospect ignoré (pas de contact). Passage au suivant...")
                     continue
                 
-                # Afficher le résumé
-                self.afficher_resume(prospect_traite)
-                
-                # Afficher les statistiques mises à jour
-                stats = self.db.obtenir_statistiques()
-                from display_utils import print_success
-                print_success(f"Statistiques mises à jour - Total: {stats['total']} | Avec email: {stats['avec_email']} | Traités: {stats['traites']}")
-                logger.info(f"📊 Statistiques - Total: {stats['total']} | Avec email: {stats['avec_email']} | Traités: {stats['traites']}")
-                
-                # Attendre avant de traiter le suivant
-                from display_utils import print_separator
-                print_separator(width=100, style="─", color=Colors.DIM + Colors.WHITE)
-                logger.info(f"⏳ Attente de {self.intervalle_traitement} secondes avant le prochain traitement...")
-                time.sleep(self.intervalle_traitement)
+                # Afficher le résumé et les statistiques mises à jour d'un seul bloc
+                with self._verrou_affichage:
+                    self.afficher_resume(prospect_traite)
+                    
+                    stats = self._statistiques_courantes()
+                    print_success(f"Statistiques mises à jour - Total: {stats['total']} | Avec email: {stats['avec_email']} | Traités: {stats['traites']}")
+                    logger.info(f"📊 Statistiques - Total: {stats['total']} | Avec email: {stats['avec_email']} | Traités: {stats['traites']}")
+                    print_separator(width=100, style="─", color=Colors.DIM + Colors.WHITE)
                 
-            except KeyboardInterrupt:
-                logger.info("\n⏹️  Arrêt demandé par l'utilisateur")
-                break
+            except ERREURS_CONFIGURATION as e:
+                # Clé ou modèle OpenAI invalide : tous les prospects suivants échoueraient de la même façon
+                logger.critical(f"❌ Configuration OpenAI invalide, arrêt de l'agent: {e}")
+                if not self._arret.is_set():
+                    self._erreur_fatale = e
+                    self._arret.set()
+                    self._demande_rechargement.set()  # réveiller la boucle principale
             except Exception as e:
                 logger.error(f"❌ Erreur lors du traitement: {e}", exc_info=True)
                 logger.info(f"⏳ Attente de {self.intervalle_traitement} secondes avant nouvelle tentative...")
                 time.sleep(self.intervalle_traitement)
-
+            finally:
+                with self._verrou_en_cours:
+                    self._prospects_en_cours.discard(
+                        (entreprise.get("nom_entreprise") or "", entreprise.get("site_web") or "")
+                    )
+                self.file_attente.task_done()
 
 def main():
     """Point d'entrée principal."""
@@ -0,0 +1,37 @@
+"""
+Compilation de listes de mots-clés en une seule expression régulière (filtres d'exclusion).
+"""
+import re
+from typing import Dict, Iterable
+
+
+def compiler_alternatives(*listes: Iterable[str]) -> re.Pattern:
+    """
+    Compile des listes de sous-chaînes en une seule regex (un seul parcours du texte).
+
+    Les motifs sont rangés dans un arbre de préfixes : à chaque position du texte, le moteur
+    ne teste que les branches qui commencent par le bon caractère au lieu de tous les motifs.
+
+    Args:
+        *listes: Listes de sous-chaînes à rechercher (en minuscules)
+
+    Returns:
+        Regex dont search() indique si le texte contient au moins une des sous-chaînes
+    """
+    arbre = {}
+    for liste in listes:
+        for motif in liste:
+            noeud = arbre
+            for caractere in motif:
+                noeud = noeud.setdefault(caractere, {})
+            noeud[""] = {}  # fin de motif
+    return re.compile(_arbre_en_regex(arbre))
+
+
+def _arbre_en_regex(noeud: Dict[str, Dict]) -> str:
+    """Convertit un arbre de préfixes en regex (seule la présence d'un motif compte)."""
+    # Un motif se termine ici : inutile de chercher les motifs plus longs qui le prolongent
+    if "" in noeud:
+        return ""
+    branches = [re.escape(caractere) + _arbre_en_regex(enfant) for caractere, enfant in sorted(noeud.items())]
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
@@ -2,11 +2,17 @@
 Module client pour OpenAI - Génération de messages personnalisés.
 """
 import json
+import functools
 import os
+import re
 import openai
 import logging
+import threading
 from typing import Dict, Any, Optional
 
+from motifs import compiler_alternatives
+from rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 # Désactiver les proxies pour OpenAI (certaines configs système causent des erreurs)
@@ -16,178 +22,155 @@ os.environ.pop('http_proxy', None)
 os.environ.pop('https_proxy', None)
 
 
-class OpenAIClient:
-    """Client pour interroger l'API OpenAI."""
+# Variables reconnues dans les templates de message (les autres accolades restent intactes)
+_VARIABLE_TEMPLATE_RE = re.compile(r"\{(nom_dirigeant|nom_entreprise|point_specifique|proposition_valeur)\}")
+
+
+def _tronquer(texte: Optional[str], longueur_max: int) -> str:
+    """Coupe un texte à longueur_max caractères (au dernier espace) en signalant la coupure."""
+    texte = texte or ""
+    if len(texte) <= longueur_max:
+        return texte
+    return texte[:longueur_max].rsplit(" ", 1)[0] + "…"
+
+
+def message_par_defaut(message_base: str, nom_entreprise: str, proposition_valeur: str) -> str:
+    """
+    Remplit un template de message avec des valeurs génériques (utilisé quand l'IA échoue).
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        """
-        Initialise le client OpenAI.
-        
-        Args:
-            api_key: Clé API OpenAI
-            model: Modèle à utiliser (par défaut: gpt-4o-mini)
-        """
-        self.api_key = api_key
-        self.model = model
+    Les variables sont remplacées en un seul passage : une valeur contenant elle-même
+    une variable (ex: "{point_specifique}") n'est pas substituée une seconde fois.
     
-    def generer_message_personnalise(self, entreprise_data: Dict[str, Any], 
-                                    message_base: str, 
-                                    proposition_valeur: str,
-                                    service_propose: str = "",
-                                    secteur_entreprise: str = "") -> Dict[str, str]:
-        """
-        Génère un message de prospection personnalisé avec GPT.
-        
-        Args:
-            entreprise_data: Dictionnaire contenant les données de l'entreprise
-            message_base: Template de message de base
-            proposition_valeur: Proposition de valeur à inclure
-        
-        Returns:
-            Dictionnaire contenant le message personnalisé et le point spécifique identifié
-        """
-        try:
-            nom_entreprise = entreprise_data.get("nom_entreprise", "cette entreprise")
-            site_web = entreprise_data.get("site_web", "")
-            description = entreprise_data.get("description", "")
-            
-            # Échapper les accolades pour éviter les problèmes avec f-strings
-            message_base_escaped = message_base.replace("{", "{{").replace("}", "}}")
-            proposition_valeur_escaped = proposition_valeur.replace("{", "{{").replace("}", "}}")
-            
-            # Ajouter contexte du secteur/service si fourni
-            contexte_service = ""
-            if service_propose:
-                contexte_service += f"\nNOTRE SERVICE: {service_propose}"
-            if secteur_entreprise:
-                contexte_service += f"\nNOTRE SECTEUR: {secteur_entreprise}"
-            
-            prompt = f"""Tu es un expert en prospection B2B universel. Analyse les informations suivantes et génère un message de prospection ultra-personnalisé adapté à NOTRE service.
-
-INFORMATIONS DE L'ENTREPRISE CIBLE:
-- Nom: {nom_entreprise}
-- Site web: {site_web}
-- Description: {description}
-{contexte_service}
+    Args:
+        message_base: Template contenant {nom_dirigeant}, {nom_entreprise}, etc.
+        nom_entreprise: Nom de l'entreprise
+        proposition_valeur: Proposition de valeur
+    
+    Returns:
+        Message rempli
+    """
+    valeurs = {
+        "nom_dirigeant": "Monsieur/Madame",
+        "nom_entreprise": nom_entreprise,
+        "point_specifique": "votre expertise",
+        "proposition_valeur": proposition_valeur,
+    }
+    return _VARIABLE_TEMPLATE_RE.sub(lambda m: valeurs[m.group(1)], message_base)
 
-TEMPLATE DE MESSAGE:
-{message_base_escaped}
+# Longueur maximale (caractères) des champs libres du prospect dans les prompts : une description
+# scrappée anormalement longue ferait exploser le coût de l'appel, voire la limite de contexte
+_LONGUEUR_MAX_DESCRIPTION = 2000
+_LONGUEUR_MAX_ADRESSE = 300
 
-PROPOSITION DE VALEUR: {proposition_valeur_escaped}
+# Erreurs de configuration (clé API invalide, droits insuffisants, modèle inexistant) : les remplacer
+# par un message par défaut masquerait le problème, elles sont remontées à l'appelant
+ERREURS_CONFIGURATION = (openai.AuthenticationError, openai.PermissionDeniedError, openai.NotFoundError)
 
-TÂCHES:
-1. Identifie UN point spécifique et positif sur cette entreprise qui montre leur qualité/expertise (ex: "votre expertise en rénovation de salles de bain", "vos 15 ans d'expérience", "votre présence sur 3 villes", "vos excellents avis clients", "votre spécialisation en [domaine]", etc.)
-2. Génère un message personnalisé en remplaçant:
-   - {{nom_entreprise}} par le vrai nom
-   - {{point_specifique}} par le point identifié
-   - {{proposition_valeur}} par la proposition fournie
-   - Adapte le ton selon le secteur et le type d'entreprise (plus formel pour cabinets, plus accessible pour commerces)
+# Nouvelles tentatives du SDK OpenAI sur erreur transitoire (2 par défaut) et délai max d'un appel (secondes)
+_REPRISES_OPENAI = 4
+_DELAI_OPENAI = 60
 
-IMPORTANT:
-- Sois naturel, authentique et professionnel
-- Inclus le point spécifique identifié pour montrer que tu connais leur entreprise
-- Adapte le langage à leur secteur d'activité
-- Reste concis et impactant
-- Termine par un appel à l'action clair et engageant
+# Exemples de propositions par type d'entreprise : seuls ceux qui correspondent au prospect sont
+# envoyés à OpenAI (tous si aucun ne correspond), le reste du prompt ne change pas
+_EXEMPLES_PAR_TYPE = (
+    (compiler_alternatives((
+        "restaurant", "boutique", "commerce", "magasin", "épicerie", "boulangerie", "pâtisserie", "boucherie", "fleuriste", "coiffeur", "salon", "retail"
+    )), """      🏪 **COMMERCES LOCAUX** (restaurants, boutiques, artisans, plombiers, électriciens, coiffeurs, boulangeries, etc.):
+      
+      **Si service web/développement:**
+      - "Site web moderne et responsive avec: système de réservation/commande en ligne intégré, carte interactive avec Google Maps pour localisation, horaires d'ouverture dynamiques, galerie photos produits/prestations, formulaire de devis/contact optimisé, intégration Google My Business, SEO local ultra-optimisé pour apparaître en première page Google lors des recherches '[ville] [métier]' ou '[votre métier] près de moi', blog avec conseils pour générer du trafic organique, système d'avis clients intégré, chat en ligne pour conversion immédiate, et optimisation mobile-first pour capturer 60%+ du trafic mobile"
+      
+      - "E-commerce léger (pour boutiques): catalogue produits, panier sécurisé, paiement en ligne, gestion stocks basique, intégration transporteurs locaux, commande et retrait en magasin"
+      
+      **Si service marketing digital:**
+      - "Stratégie marketing digitale complète: optimisation Google My Business pour apparaître en map pack Google, stratégie de collecte d'avis clients (objectif 4.7+ étoiles), campagnes Google Ads locales ciblées '[ville] [métier]', campagnes Facebook/Instagram avec géolocalisation, partenariats avec influenceurs locaux, email marketing pour fidélisation, contenu Instagram/Facebook régulier (stories, posts, reels), campagnes saisonnières et événementielles, système de parrainage digital"
+"""),
+    (compiler_alternatives((
+        "cabinet", "fiduciaire", "comptable", "avocat", "notaire", "architecte", "consultant", "conseil", "agence", "bureau"
+    )), """      🏢 **SERVICES PROFESSIONNELS** (cabinets comptables, fiduciaires, avocats, architectes, consultants, agences):
+      
+      **Si service web/développement:**
+      - "Site web corporate professionnel avec: présentation détaillée de l'équipe et expertise, blog régulier avec conseils/contenus de valeur (SEO + autorité), formulaire de contact avancé avec qualification leads, section témoignages clients, présentation des services avec cas d'études, intégration calendrier pour prise de RDV en ligne, zone membres/client privée si nécessaire, SEO professionnel pour '[ville] [service]', intégration LinkedIn pour crédibilité, newsletter pour nurturing, et design premium qui inspire confiance"
+      
+      **Si service marketing digital:**
+      - "Stratégie B2B digitale: LinkedIn company page optimisée + LinkedIn Ads ciblés dirigeants, content marketing avec articles LinkedIn/Medium, stratégie de référencement professionnel, email marketing B2B ciblé, webinaires ou événements en ligne, partenariats stratégiques B2B, stratégie de pensée leadership, génération de leads qualifiés via formulaires/gated content"
+"""),
+    (compiler_alternatives((
+        "hôtel", "hotel", "restaurant", "brasserie", "pizzeria", "café", "traiteur", "auberge"
+    )), """      🏨 **HÔTELS/RESTAURANTS:**
+      
+      **Si service web/développement:**
+      - "Site web haut de gamme avec: système de réservation en ligne intégré (Booking.com, Airbnb, ou système propriétaire), galerie photos immersives (chambres, plats, ambiance), menu interactif en ligne (restaurants), intégration avis clients (TripAdvisor, Google), système de newsletter pour offres spéciales, blog voyage/culinaire pour SEO, optimisation mobile ultra-importante, intégration Google Maps avec itinéraires, multilingue si zone touristique, booking calendar pour disponibilités en temps réel"
+      
+      **Si service marketing digital:**
+      - "Stratégie digitale hôtellerie/restauration: présence Instagram forte (photos plats/chambres, stories quotidiennes), campagnes Google Ads 'hôtel [ville]' et 'restaurant [ville]', gestion proactive des avis (répondre à tous, améliorer notes), partenariats avec blogueurs voyage/food, stratégie TripAdvisor, email marketing avec offres exclusives, campagnes saisonnières (été, Noël, etc.), influencer marketing local, live Instagram/Facebook pour engagement"
+"""),
+    (compiler_alternatives((
+        "industrie", "industriel", "usine", "fabricant", "fabrication", "manufacture", "production", "mécanique", "métallurgie"
+    )), """      🏭 **INDUSTRIES/MANUFACTURING:**
+      
+      **Si service web/développement:**
+      - "Site vitrine professionnel avec: présentation complète produits/services avec fiches techniques, catalogue téléchargeable, formulaire de devis professionnel, zone d'intervention claire (si services), section actualités/projets, présentation équipements/capacités, intégration vidéos/tours virtuels, blog industriel, SEO technique pour '[ville] [service industriel]', version multilingue si export, zone clients fournisseurs si nécessaire"
+      
+      **Si service marketing digital:**
+      - "Stratégie B2B industrielle: LinkedIn Ads ciblés décideurs, content marketing technique (blancs livres, études de cas), référencement pour recherches professionnelles, email marketing B2B sectoriel, présence salons/professionnels en ligne, génération de leads qualifiés B2B, stratégie de pensée leadership industrielle"
+"""),
+    (compiler_alternatives((
+        "e-commerce", "ecommerce", "boutique en ligne", "vente en ligne", "shop"
+    )), """      🛍️ **E-COMMERCE/BOUTIQUES EN LIGNE:**
+      
+      **Si service web/développement:**
+      - "Boutique e-commerce complète avec: catalogue produits avec filtres avancés, système de paiement sécurisé multi-moyens, gestion stocks en temps réel, intégration transporteurs, suivi commandes client, système d'avis produits, recommandations produits (upsell/cross-sell), blog mode/conseils, SEO e-commerce pour produits + marques, optimisation conversion (A/B testing), version mobile parfaite, système de fidélité/codes promo"
+      
+      **Si service marketing digital:**
+      - "Stratégie e-commerce: Google Shopping Ads, Facebook/Instagram Shopping, campagnes retargeting, email marketing transactionnel + marketing, influenceurs mode/lifestyle, SEO produits, Google Ads saisonniers, stratégie contenu Instagram/Pinterest, partenariats avec marques complémentaires"
+"""),
+    (compiler_alternatives((
+        "plombier", "électricien", "maçon", "menuisier", "charpentier", "peintre", "chauffagiste", "couvreur", "serrurier", "carreleur", "artisan"
+    )), """      🎨 **ARTISANS/MÉTIERS (plombiers, électriciens, maçons, menuisiers, etc.):**
+      
+      **Si service web/développement:**
+      - "Site web artisan professionnel avec: galerie photos avant/après réalisations, présentation services avec prix indicatifs, formulaire de devis rapide et simple, zone d'intervention claire sur carte, intégration appels d'urgence, système de rendez-vous en ligne, avis clients intégrés, blog conseils/astuces, SEO local pour '[ville] [métier] urgence', optimisation mobile (chercheurs sur mobile)"
+      
+      **Si service marketing digital:**
+      - "Stratégie digitale artisan: Google Ads '[métier] [ville] urgence', optimisation Google My Business (photos, horaires, avis), Facebook local avec réalisations, partenariats avec artisans complémentaires, système collecte avis clients, email marketing maintenance/prévention, campagnes saisonnières (chauffage, climatisation, etc.)"
+"""),
+    (compiler_alternatives((
+        "médecin", "médical", "dentiste", "dentaire", "clinique", "santé", "physiothérap", "kiné", "ostéopat", "pharmacie", "vétérinaire"
+    )), """      💼 **CABINETS MÉDICAUX/SANTÉ:**
+      
+      **Si service web/développement:**
+      - "Site web médical professionnel avec: prise de rendez-vous en ligne, présentation équipe médicale, spécialités/services, blog santé/conseils, formulaire contact, intégration Google My Business, respect RGPD et confidentialité, version multilingue si nécessaire, section urgences, horaires et disponibilités"
+      
+      **Si service marketing digital:**
+      - "Stratégie digitale santé: référencement local, gestion avis Google, campagnes Google Ads locaux, emailing patients (rappel RDV, prévention), contenu éducatif santé, partenariats autres professionnels santé, respect réglementation publicité médicale"
+"""),
+)
 
-Réponds UNIQUEMENT avec un JSON au format suivant (sans markdown, sans code block):
-{{
+# Format de réponse JSON attendu (ajouté à la fin du prompt)
+_FORMAT_JSON_ANALYSE_ET_MESSAGE = """Réponds UNIQUEMENT avec un seul objet JSON regroupant les résultats des deux tâches:
+{
+    "raison_choix": "Pourquoi cette entreprise a besoin de notre service spécifique (3-4 phrases, factuel)",
+    "proposition_service": "Comment notre service s'applique à leur contexte (4-5 phrases, concret et mesurable)",
     "point_specifique": "le point identifié ici",
     "message_personnalise": "le message complet ici"
-            }}
+}
 """
-            
-            # Créer le client OpenAI sans proxies
-            client = openai.OpenAI(
-                api_key=self.api_key,
-                # S'assurer qu'aucun proxy n'est utilisé
-                http_client=None
-            )
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "Tu es un expert en prospection B2B. Tu génères toujours des réponses au format JSON valide."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            # Nettoyer le contenu si il contient des markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            result = json.loads(content)
-            
-            logger.info(f"Message personnalisé généré pour {nom_entreprise}")
-            return {
-                "message_personnalise": result.get("message_personnalise", message_base),
-                "point_specifique": result.get("point_specifique", "expertise dans votre domaine")
-            }
-            
-        except json.JSONDecodeError as e:
-            logger.error(f"Erreur de parsing JSON: {e}")
-            # Retourner un message par défaut
-            return {
-                "message_personnalise": message_base.replace("{nom_dirigeant}", "Monsieur/Madame")
-                    .replace("{nom_entreprise}", nom_entreprise)
-                    .replace("{point_specifique}", "votre expertise")
-                    .replace("{proposition_valeur}", proposition_valeur),
-                "point_specifique": "expertise dans votre domaine"
-            }
-        except Exception as e:
-            logger.error(f"Erreur lors de la génération du message pour {nom_entreprise}: {e}")
-            # Retourner un message par défaut
-            return {
-                "message_personnalise": message_base.replace("{nom_dirigeant}", "Monsieur/Madame")
-                    .replace("{nom_entreprise}", nom_entreprise)
-                    .replace("{point_specifique}", "votre expertise")
-                    .replace("{proposition_valeur}", proposition_valeur),
-                "point_specifique": "expertise dans votre domaine"
-            }
-    
-    def analyser_entreprise_pertinence(self, entreprise_data: Dict[str, Any], 
-                                      service_propose: str, 
-                                      secteur_entreprise: str) -> Dict[str, str]:
-        """
-        Analyse une entreprise pour expliquer pourquoi elle est pertinente et ce qu'on peut lui proposer.
-        
-        Args:
-            entreprise_data: Dictionnaire contenant les données de l'entreprise
-            service_propose: Service que nous proposons
-            secteur_entreprise: Secteur dans lequel nous travaillons
-        
-        Returns:
-            Dictionnaire contenant:
-            - raison_choix: Pourquoi cette entreprise a été choisie
-            - proposition_service: Ce qu'on peut vraiment leur proposer
-        """
-        try:
-            nom_entreprise = entreprise_data.get("nom_entreprise", "cette entreprise")
-            site_web = entreprise_data.get("site_web", "")
-            description = entreprise_data.get("description", "")
-            adresse = entreprise_data.get("adresse_complete", "")
-            industrie = entreprise_data.get("industrie", "")
-            taille = entreprise_data.get("taille_entreprise", "")
-            note_google = entreprise_data.get("note_google")
-            nb_avis = entreprise_data.get("nb_avis_google")
-            
-            prompt = f"""Tu es un expert en prospection B2B universel. Analyse cette entreprise et génère une proposition UNIQUE et PERSONNALISÉE adaptée à NOTRE service spécifique.
 
-INFORMATIONS DE L'ENTREPRISE À PROSPECTER:
-- Nom: {nom_entreprise}
-- Site web: {site_web}
-- Description: {description}
-- Adresse: {adresse}
-- Industrie: {industrie}
-- Taille: {taille}
-- Note Google: {note_google}
-- Nombre d'avis: {nb_avis}
+
+@functools.lru_cache(maxsize=32)
+def _consignes_analyse(service_propose: str, secteur_entreprise: str) -> str:
+    """
+    Consignes fixes de l'analyse de pertinence, construites une fois par service/secteur.
+    
+    Args:
+        service_propose: Service que nous proposons
+        secteur_entreprise: Secteur dans lequel nous travaillons
+    
+    Returns:
+        Début du prompt d'analyse (identique pour tous les prospects d'une campagne)
+    """
+    return f"""Tu es un expert en prospection B2B universel. Analyse l'entreprise décrite à la fin de ces consignes et génère une proposition UNIQUE et PERSONNALISÉE adaptée à NOTRE service spécifique.
 
 NOTRE ENTREPRISE (LE VENDEUR):
 - Secteur d'activité: {secteur_entreprise}
@@ -207,7 +190,7 @@ ANALYSE INTELLIGENTE ET ADAPTATIVE:
       **POUR SERVICES WEB/DÉVELOPPEMENT:**
       
       🔍 **Analyse du site web (si existe):**
-      - Site web: {site_web}
+      - Site web: voir les informations de l'entreprise
       - Vérifie si le site existe réellement, s'il est accessible, s'il charge vite
       - Design obsolète (style années 2010, couleurs passées, typographie datée)
       - Site non responsive (ne s'adapte pas au mobile/tablette) = 60%+ des visiteurs perdus
@@ -289,65 +272,7 @@ ANALYSE INTELLIGENTE ET ADAPTATIVE:
    
    a) IDENTIFIE comment notre service s'applique à leur type d'entreprise avec DÉTAILS TECHNIQUES:
       
-      **PROPOSITIONS APPROFONDIES PAR TYPE D'ENTREPRISE** (développeurs web, agences web, agences de com):
-      
-      🏪 **COMMERCES LOCAUX** (restaurants, boutiques, artisans, plombiers, électriciens, coiffeurs, boulangeries, etc.):
-      
-      **Si service web/développement:**
-      - "Site web moderne et responsive avec: système de réservation/commande en ligne intégré, carte interactive avec Google Maps pour localisation, horaires d'ouverture dynamiques, galerie photos produits/prestations, formulaire de devis/contact optimisé, intégration Google My Business, SEO local ultra-optimisé pour apparaître en première page Google lors des recherches '[ville] [métier]' ou '[votre métier] près de moi', blog avec conseils pour générer du trafic organique, système d'avis clients intégré, chat en ligne pour conversion immédiate, et optimisation mobile-first pour capturer 60%+ du trafic mobile"
-      
-      - "E-commerce léger (pour boutiques): catalogue produits, panier sécurisé, paiement en ligne, gestion stocks basique, intégration transporteurs locaux, commande et retrait en magasin"
-      
-      **Si service marketing digital:**
-      - "Stratégie marketing digitale complète: optimisation Google My Business pour apparaître en map pack Google, stratégie de collecte d'avis clients (objectif 4.7+ étoiles), campagnes Google Ads locales ciblées '[ville] [métier]', campagnes Facebook/Instagram avec géolocalisation, partenariats avec influenceurs locaux, email marketing pour fidélisation, contenu Instagram/Facebook régulier (stories, posts, reels), campagnes saisonnières et événementielles, système de parrainage digital"
-      
-      🏢 **SERVICES PROFESSIONNELS** (cabinets comptables, fiduciaires, avocats, architectes, consultants, agences):
-      
-      **Si service web/développement:**
-      - "Site web corporate professionnel avec: présentation détaillée de l'équipe et expertise, blog régulier avec conseils/contenus de valeur (SEO + autorité), formulaire de contact avancé avec qualification leads, section témoignages clients, présentation des services avec cas d'études, intégration calendrier pour prise de RDV en ligne, zone membres/client privée si nécessaire, SEO professionnel pour '[ville] [service]', intégration LinkedIn pour crédibilité, newsletter pour nurturing, et design premium qui inspire confiance"
-      
-      **Si service marketing digital:**
-      - "Stratégie B2B digitale: LinkedIn company page optimisée + LinkedIn Ads ciblés dirigeants, content marketing avec articles LinkedIn/Medium, stratégie de référencement professionnel, email marketing B2B ciblé, webinaires ou événements en ligne, partenariats stratégiques B2B, stratégie de pensée leadership, génération de leads qualifiés via formulaires/gated content"
-      
-      🏨 **HÔTELS/RESTAURANTS:**
-      
-      **Si service web/développement:**
-      - "Site web haut de gamme avec: système de réservation en ligne intégré (Booking.com, Airbnb, ou système propriétaire), galerie photos immersives (chambres, plats, ambiance), menu interactif en ligne (restaurants), intégration avis clients (TripAdvisor, Google), système de newsletter pour offres spéciales, blog voyage/culinaire pour SEO, optimisation mobile ultra-importante, intégration Google Maps avec itinéraires, multilingue si zone touristique, booking calendar pour disponibilités en temps réel"
-      
-      **Si service marketing digital:**
-      - "Stratégie digitale hôtellerie/restauration: présence Instagram forte (photos plats/chambres, stories quotidiennes), campagnes Google Ads 'hôtel [ville]' et 'restaurant [ville]', gestion proactive des avis (répondre à tous, améliorer notes), partenariats avec blogueurs voyage/food, stratégie TripAdvisor, email marketing avec offres exclusives, campagnes saisonnières (été, Noël, etc.), influencer marketing local, live Instagram/Facebook pour engagement"
-      
-      🏭 **INDUSTRIES/MANUFACTURING:**
-      
-      **Si service web/développement:**
-      - "Site vitrine professionnel avec: présentation complète produits/services avec fiches techniques, catalogue téléchargeable, formulaire de devis professionnel, zone d'intervention claire (si services), section actualités/projets, présentation équipements/capacités, intégration vidéos/tours virtuels, blog industriel, SEO technique pour '[ville] [service industriel]', version multilingue si export, zone clients fournisseurs si nécessaire"
-      
-      **Si service marketing digital:**
-      - "Stratégie B2B industrielle: LinkedIn Ads ciblés décideurs, content marketing technique (blancs livres, études de cas), référencement pour recherches professionnelles, email marketing B2B sectoriel, présence salons/professionnels en ligne, génération de leads qualifiés B2B, stratégie de pensée leadership industrielle"
-      
-      🛍️ **E-COMMERCE/BOUTIQUES EN LIGNE:**
-      
-      **Si service web/développement:**
-      - "Boutique e-commerce complète avec: catalogue produits avec filtres avancés, système de paiement sécurisé multi-moyens, gestion stocks en temps réel, intégration transporteurs, suivi commandes client, système d'avis produits, recommandations produits (upsell/cross-sell), blog mode/conseils, SEO e-commerce pour produits + marques, optimisation conversion (A/B testing), version mobile parfaite, système de fidélité/codes promo"
-      
-      **Si service marketing digital:**
-      - "Stratégie e-commerce: Google Shopping Ads, Facebook/Instagram Shopping, campagnes retargeting, email marketing transactionnel + marketing, influenceurs mode/lifestyle, SEO produits, Google Ads saisonniers, stratégie contenu Instagram/Pinterest, partenariats avec marques complémentaires"
-      
-      🎨 **ARTISANS/MÉTIERS (plombiers, électriciens, maçons, menuisiers, etc.):**
-      
-      **Si service web/développement:**
-      - "Site web artisan professionnel avec: galerie photos avant/après réalisations, présentation services avec prix indicatifs, formulaire de devis rapide et simple, zone d'intervention claire sur carte, intégration appels d'urgence, système de rendez-vous en ligne, avis clients intégrés, blog conseils/astuces, SEO local pour '[ville] [métier] urgence', optimisation mobile (chercheurs sur mobile)"
-      
-      **Si service marketing digital:**
-      - "Stratégie digitale artisan: Google Ads '[métier] [ville] urgence', optimisation Google My Business (photos, horaires, avis), Facebook local avec réalisations, partenariats avec artisans complémentaires, système collecte avis clients, email marketing maintenance/prévention, campagnes saisonnières (chauffage, climatisation, etc.)"
-      
-      💼 **CABINETS MÉDICAUX/SANTÉ:**
-      
-      **Si service web/développement:**
-      - "Site web médical professionnel avec: prise de rendez-vous en ligne, présentation équipe médicale, spécialités/services, blog santé/conseils, formulaire contact, intégration Google My Business, respect RGPD et confidentialité, version multilingue si nécessaire, section urgences, horaires et disponibilités"
-      
-      **Si service marketing digital:**
-      - "Stratégie digitale santé: référencement local, gestion avis Google, campagnes Google Ads locaux, emailing patients (rappel RDV, prévention), contenu éducatif santé, partenariats autres professionnels santé, respect réglementation publicité médicale"
+      **PROPOSITIONS APPROFONDIES PAR TYPE D'ENTREPRISE**: voir les exemples à la fin de ces consignes
       
       ⚡ **POUR TOUT AUTRE TYPE D'ENTREPRISE:**
       - Analyse intelligemment le secteur, la taille, et les besoins spécifiques
@@ -439,55 +364,226 @@ RÈGLES CRITIQUES:
 - ✅ Sois CRÉATIF mais FACTUEL (pas de promesses non fondées)
 - ✅ Mentionne des bénéfices CONCRETS et MESURABLES quand possible
 
-Réponds UNIQUEMENT avec un JSON valide (sans markdown, sans code block):
-{{
-    "raison_choix": "Pourquoi cette entreprise a besoin de notre service spécifique (3-4 phrases, factuel)",
-    "proposition_service": "Comment notre service s'applique à leur contexte (4-5 phrases, concret et mesurable)"
-}}
 """
-            
-            # Créer le client OpenAI sans proxies
-            client = openai.OpenAI(
-                api_key=self.api_key,
-                # S'assurer qu'aucun proxy n'est utilisé
-                http_client=None
-            )
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "Tu es un expert en prospection B2B ultra-créatif. Tu génères TOUJOURS des propositions UNIQUES et DIFFÉRENTES pour chaque entreprise. JAMAIS de texte identique ou similaire. Chaque entreprise mérite une proposition personnalisée adaptée à son type exact et ses besoins spécifiques. Sois créatif et inventif. Tu génères toujours des réponses au format JSON valide."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.9,  # Température plus élevée pour plus de créativité et d'unicité
-                max_tokens=700    # Plus de tokens pour des propositions détaillées et uniques
+
+
+class OpenAIClient:
+    """Client pour interroger l'API OpenAI."""
+    
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", max_requetes_simultanees: int = 4,
+                 requetes_par_minute: Optional[float] = None, tokens_par_minute: Optional[float] = None):
+        """
+        Initialise le client OpenAI.
+        
+        Args:
+            api_key: Clé API OpenAI
+            model: Modèle à utiliser (par défaut: gpt-4o-mini)
+            max_requetes_simultanees: Nombre maximum d'appels OpenAI en parallèle (partagé entre workers)
+            requetes_par_minute: Quota d'appels par minute (None = pas de limite)
+            tokens_par_minute: Quota de tokens par minute, prompt + max_tokens (None = pas de limite)
+        """
+        self.api_key = api_key
+        self.model = model
+        self._semaphore = threading.BoundedSemaphore(max_requetes_simultanees)
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
+        self._limiteur_tokens = RateLimiter(tokens_par_minute) if tokens_par_minute else None
+        # Client OpenAI sans proxies, créé une fois : son pool de connexions HTTP (keep-alive TLS)
+        # est réutilisé par tous les appels et partagé entre les workers
+        self._client = openai.OpenAI(
+            api_key=self.api_key,
+            # S'assurer qu'aucun proxy n'est utilisé
+            http_client=None,
+            # Les erreurs transitoires (429, 5xx, timeout, coupure réseau) sont retentées par le SDK
+            # avec attente exponentielle et aléatoire avant de retomber sur le message par défaut
+            max_retries=_REPRISES_OPENAI,
+            timeout=_DELAI_OPENAI
+        )
+    
+    def analyser_et_generer(self, entreprise_data: Dict[str, Any],
+                            message_base: str,
+                            proposition_valeur: str,
+                            service_propose: str = "",
+                            secteur_entreprise: str = "") -> Dict[str, str]:
+        """
+        Analyse la pertinence de l'entreprise et génère le message personnalisé en un seul appel.
+        
+        Les deux tâches sont indépendantes : un seul aller-retour vers OpenAI au lieu de deux.
+        
+        Args:
+            entreprise_data: Dictionnaire contenant les données de l'entreprise
+            message_base: Template de message de base
+            proposition_valeur: Proposition de valeur à inclure
+            service_propose: Service que nous proposons
+            secteur_entreprise: Secteur dans lequel nous travaillons
+        
+        Returns:
+            Dictionnaire contenant raison_choix, proposition_service, point_specifique et message_personnalise
+            (plus une clé "erreur" si l'appel a échoué et que les valeurs par défaut sont utilisées)
+        """
+        nom_entreprise = entreprise_data.get("nom_entreprise", "cette entreprise")
+        raison_defaut = f"PME locale qui pourrait bénéficier de {service_propose}"
+        proposition_defaut = f"Amélioration de leur présence digitale avec {service_propose}"
+        
+        try:
+            prompt = (
+                "Tu dois réaliser DEUX tâches indépendantes pour la même entreprise.\n\n"
+                "=== TÂCHE 1 : ANALYSE DE PERTINENCE ===\n"
+                + self._construire_prompt_analyse(entreprise_data, service_propose, secteur_entreprise)
+                + "\n=== TÂCHE 2 : MESSAGE PERSONNALISÉ ===\n"
+                + self._construire_prompt_message(
+                    entreprise_data, message_base, proposition_valeur, service_propose, secteur_entreprise
+                )
+                + _FORMAT_JSON_ANALYSE_ET_MESSAGE
             )
             
-            content = response.choices[0].message.content.strip()
-            
-            # Nettoyer le contenu si il contient des markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
+            max_tokens = 1000  # Analyse (500) + message (500)
+            self._attendre_quota(prompt, max_tokens)
+            with self._semaphore:
+                response = self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "Tu es un expert en prospection B2B ultra-créatif. Chaque entreprise mérite une analyse et un message personnalisés, adaptés à son type exact et ses besoins spécifiques. Tu génères toujours des réponses au format JSON valide."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},  # JSON garanti, pas de bloc markdown à nettoyer
+                    # raison_choix est factuelle et le message suit le template : moins de variance, JSON plus stable
+                    temperature=0.5,
+                    max_tokens=max_tokens
+                )
             
-            result = json.loads(content)
+            result = json.loads(response.choices[0].message.content)
             
-            logger.info(f"Analyse de pertinence générée pour {nom_entreprise}")
+            logger.info(f"Analyse de pertinence et message générés pour {nom_entreprise}")
             return {
-                "raison_choix": result.get("raison_choix", "PME locale qui pourrait bénéficier de nos services"),
-                "proposition_service": result.get("proposition_service", f"Amélioration de leur présence digitale avec {service_propose}")
+                "raison_choix": result.get("raison_choix") or raison_defaut,
+                "proposition_service": result.get("proposition_service") or proposition_defaut,
+                "message_personnalise": result.get("message_personnalise", message_base),
+                "point_specifique": result.get("point_specifique", "expertise dans votre domaine")
             }
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Erreur de parsing JSON dans analyse: {e}")
-            return {
-                "raison_choix": f"PME locale qui pourrait bénéficier de {service_propose}",
-                "proposition_service": f"Amélioration de leur présence digitale avec {service_propose}"
-            }
+        except ERREURS_CONFIGURATION as e:
+            logger.critical(f"Configuration OpenAI invalide (clé API, droits ou modèle): {e}")
+            raise
         except Exception as e:
-            logger.error(f"Erreur lors de l'analyse de pertinence pour {nom_entreprise}: {e}")
+            logger.error(f"Erreur lors de l'analyse et de la génération du message pour {nom_entreprise}: {e}")
+            # Retourner une analyse et un message par défaut (marqués en erreur pour ne pas être mis en cache)
             return {
-                "raison_choix": f"PME locale qui pourrait bénéficier de {service_propose}",
-                "proposition_service": f"Amélioration de leur présence digitale avec {service_propose}"
+                "raison_choix": raison_defaut,
+                "proposition_service": proposition_defaut,
+                "message_personnalise": message_par_defaut(message_base, nom_entreprise, proposition_valeur),
+                "point_specifique": "expertise dans votre domaine",
+                "erreur": str(e)
             }
+    
+    def _attendre_quota(self, prompt: str, max_tokens: int):
+        """
+        Attend que les quotas OpenAI (requêtes et tokens par minute) autorisent un appel.
+        
+        Args:
+            prompt: Prompt envoyé (tokens estimés à ~4 caractères par token)
+            max_tokens: Tokens de réponse demandés, comptés par OpenAI dans le quota
+        """
+        if self._limiteur:
+            self._limiteur.attendre()
+        if self._limiteur_tokens:
+            self._limiteur_tokens.attendre(len(prompt) / 4 + max_tokens)
+    
+    def _construire_prompt_message(self, entreprise_data: Dict[str, Any], message_base: str, proposition_valeur: str,
+                                   service_propose: str = "", secteur_entreprise: str = "") -> str:
+        """
+        Construit les consignes de génération du message personnalisé (sans le format de réponse).
+        
+        Args:
+            entreprise_data: Dictionnaire contenant les données de l'entreprise
+            message_base: Template de message de base
+            proposition_valeur: Proposition de valeur à inclure
+            service_propose: Service que nous proposons
+            secteur_entreprise: Secteur dans lequel nous travaillons
+        
+        Returns:
+            Prompt à compléter par le format JSON attendu
+        """
+        nom_entreprise = entreprise_data.get("nom_entreprise", "cette entreprise")
+        site_web = entreprise_data.get("site_web", "")
+        description = _tronquer(entreprise_data.get("description", ""), _LONGUEUR_MAX_DESCRIPTION)
+        
+        # Ajouter contexte du secteur/service si fourni
+        contexte_service = ""
+        if service_propose:
+            contexte_service += f"\nNOTRE SERVICE: {service_propose}"
+        if secteur_entreprise:
+            contexte_service += f"\nNOTRE SECTEUR: {secteur_entreprise}"
+        
+        return f"""Tu es un expert en prospection B2B universel. Analyse les informations suivantes et génère un message de prospection ultra-personnalisé adapté à NOTRE service.
+
+INFORMATIONS DE L'ENTREPRISE CIBLE:
+- Nom: {nom_entreprise}
+- Site web: {site_web}
+- Description: {description}
+{contexte_service}
+
+TEMPLATE DE MESSAGE:
+{message_base}
+
+PROPOSITION DE VALEUR: {proposition_valeur}
+
+TÂCHES:
+1. Identifie UN point spécifique et positif sur cette entreprise qui montre leur qualité/expertise (ex: "votre expertise en rénovation de salles de bain", "vos 15 ans d'expérience", "votre présence sur 3 villes", "vos excellents avis clients", "votre spécialisation en [domaine]", etc.)
+2. Génère un message personnalisé en remplaçant:
+   - {{nom_entreprise}} par le vrai nom
+   - {{point_specifique}} par le point identifié
+   - {{proposition_valeur}} par la proposition fournie
+   - Adapte le ton selon le secteur et le type d'entreprise (plus formel pour cabinets, plus accessible pour commerces)
+
+IMPORTANT:
+- Sois naturel, authentique et professionnel
+- Inclus le point spécifique identifié pour montrer que tu connais leur entreprise
+- Adapte le langage à leur secteur d'activité
+- Reste concis et impactant
+- Termine par un appel à l'action clair et engageant
+
+"""
+    
+    def _construire_prompt_analyse(self, entreprise_data: Dict[str, Any], service_propose: str,
+                                   secteur_entreprise: str) -> str:
+        """
+        Construit les consignes d'analyse de pertinence (sans le format de réponse).
+        
+        Args:
+            entreprise_data: Dictionnaire contenant les données de l'entreprise
+            service_propose: Service que nous proposons
+            secteur_entreprise: Secteur dans lequel nous travaillons
+        
+        Returns:
+            Prompt à compléter par le format JSON attendu
+        """
+        nom_entreprise = entreprise_data.get("nom_entreprise", "cette entreprise")
+        site_web = entreprise_data.get("site_web", "")
+        description = _tronquer(entreprise_data.get("description", ""), _LONGUEUR_MAX_DESCRIPTION)
+        adresse = _tronquer(entreprise_data.get("adresse_complete", ""), _LONGUEUR_MAX_ADRESSE)
+        industrie = entreprise_data.get("industrie", "")
+        taille = entreprise_data.get("taille_entreprise", "")
+        note_google = entreprise_data.get("note_google")
+        nb_avis = entreprise_data.get("nb_avis_google")
+        
+        # Exemples de propositions limités au type de l'entreprise (nom, description, industrie)
+        texte_type = f"{nom_entreprise} {description or ''} {industrie or ''}".lower()
+        exemples = [exemple for mots_cles_re, exemple in _EXEMPLES_PAR_TYPE if mots_cles_re.search(texte_type)]
+        exemples_par_type = "\n".join(exemples or [exemple for _, exemple in _EXEMPLES_PAR_TYPE])
+        
+        # Consignes fixes en tête, données du prospect à la fin : le début du prompt est identique
+        # d'un appel à l'autre et profite du cache de prompt d'OpenAI (tarif et latence réduits)
+        return _consignes_analyse(service_propose, secteur_entreprise) + f"""EXEMPLES DE PROPOSITIONS PAR TYPE D'ENTREPRISE (développeurs web, agences web, agences de com):
+
+{exemples_par_type}
+INFORMATIONS DE L'ENTREPRISE À PROSPECTER:
+- Nom: {nom_entreprise}
+- Site web: {site_web}
+- Description: {description}
+- Adresse: {adresse}
+- Industrie: {industrie}
+- Taille: {taille}
+- Note Google: {note_google}
+- Nombre d'avis: {nb_avis}
+
+"""
@@ -0,0 +1,49 @@
+"""
+Limiteur de débit (token bucket) partagé entre les threads pour respecter les quotas des APIs.
+"""
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    Limite le nombre d'appels par minute à une API, quel que soit le nombre de workers.
+    
+    Un appel peut aussi consommer plusieurs jetons (ex: quota de tokens OpenAI par minute).
+    """
+    
+    def __init__(self, requetes_par_minute: float):
+        """
+        Initialise le limiteur.
+        
+        Args:
+            requetes_par_minute: Nombre maximum de requêtes (ou de jetons) autorisées par minute
+        """
+        self.capacite = max(1.0, float(requetes_par_minute))
+        self.debit = self.capacite / 60.0  # jetons regagnés par seconde
+        self._jetons = self.capacite
+        self._derniere_maj = time.monotonic()
+        self._verrou = threading.Lock()
+    
+    def attendre(self, jetons: float = 1):
+        """
+        Bloque jusqu'à ce qu'un appel soit autorisé, puis consomme ses jetons.
+        
+        Args:
+            jetons: Jetons consommés par l'appel (plafonnés à la capacité pour ne pas bloquer indéfiniment)
+        """
+        jetons = min(float(jetons), self.capacite)
+        while True:
+            with self._verrou:
+                maintenant = time.monotonic()
+                self._jetons = min(self.capacite, self._jetons + (maintenant - self._derniere_maj) * self.debit)
+                self._derniere_maj = maintenant
+                
+                if self._jetons >= jetons:
+                    self._jetons -= jetons
+                    return
+                
+                attente = (jetons - self._jetons) / self.debit
+            
+            # Dormir hors du verrou pour laisser les autres threads recalculer leur attente
+            time.sleep(attente)
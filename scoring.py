@@ -120,14 +120,17 @@ class ProspectScoring:
         
         # Analyse préalable du site web
         site_web = prospect.get("site_web", "")
-        technologies_str = prospect.get("technologies", "")
-        if technologies_str:
-            if isinstance(technologies_str, str):
-                technologies = [t.strip() for t in technologies_str.split(",") if t.strip()]
+        # Liste déjà découpée par l'agent si disponible, sinon chaîne "a,b,c" telle qu'en base
+        technologies = prospect.get("technologies_liste")
+        if technologies is None:
+            technologies_str = prospect.get("technologies", "")
+            if technologies_str:
+                if isinstance(technologies_str, str):
+                    technologies = [t.strip() for t in technologies_str.split(",") if t.strip()]
+                else:
+                    technologies = technologies_str if isinstance(technologies_str, list) else []
             else:
-                technologies = technologies_str if isinstance(technologies_str, list) else []
-        else:
-            technologies = []
+                technologies = []
         
         signaux_site = self._analyser_site_web(site_web, technologies)
         
@@ -4,23 +4,116 @@ Module client pour l'API Serper.dev - Recherche d'entreprises.
 import requests
 import logging
 import os
+import re
+import threading
 from typing import List, Dict, Any, Optional
 
+from http_session import activer_reprises, creer_session
+from motifs import compiler_alternatives
+from rate_limiter import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
+# Domaines à exclure : gouvernementaux, grandes plateformes, immobilier, groupes/hôtels, etc.
+_DOMAINES_EXCLUS = (
+    # Gouvernemental/Public
+    ".gov", ".gouv", ".admin.ch", "ge.ch", "ville-", "commune-",
+    "administration", "canton", "service-public", "public-",
+    "/ville/", "/commune/", "/administration/", "portail-public",
+    # Grandes plateformes/Annuaires
+    "wikipedia.org", "facebook.com", "linkedin.com", "twitter.com",
+    "instagram.com", "youtube.com", "google.com", "maps.google",
+    "pagesjaunes", "annuaire", "annuaire-", "comparis.ch",
+    # Médias (sites de presse)
+    "rts.ch", "24heures.ch", "lematin.ch", "20min.ch", "letemps.ch",
+    "tdg.ch", "blick.ch", "srf.ch", "nzz.ch",
+    # Immobilier
+    "homegate.ch", "immoscout24.ch", "immoweb.ch", "anibis.ch",
+    "immobilier", "real-estate", "agence-immobiliere",
+    # Grandes chaînes/Groups (hôtels, restaurants de chaînes)
+    "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
+    "airbnb.com", "trivago.com", "agoda.com", "hotels.com",
+    "groupon.com", "uber.com", "deliveroo.com", "justeat.com",
+    # E-commerce/Marketplaces
+    "amazon", "galaxus.ch", "digitec.ch", "ricardo.ch",
+    "coop.ch", "migros.ch",
+    # Voyages
+    "booking.com", "trivago", "tripadvisor",
+    # Autres grandes bases de données
+    "ch.ch", "search.ch", "local.ch"
+)
+
+# URLs avec des patterns suspects (sites génériques de groupes)
+# Exemples: restaurants.accor.com, hotels.booking.com, etc.
+_PATTERNS_URL_EXCLUS = (
+    "/restaurant-", "/hotel-", "/shop-", "/store-", "/location-",
+    "/fr/restaurant", "/fr/hotel", "/en/restaurant", "/en/hotel",
+    "/restaurant/", "/hotel/", "/location/",
+    ".accor.", ".booking.", ".expedia.", ".tripadvisor.",
+    "restaurants.", "hotels.", "shops."
+)
+
+# Mots-clés qui indiquent un site non pertinent (gouvernemental, grande entreprise, immobilier)
+_MOTS_EXCLUS = (
+    # Gouvernemental/Public
+    "ville de", "commune de", "administration", "canton", "canton de",
+    "service public", "gouvernement", "municipalité", "mairie",
+    "préfecture", "département", "région", "office cantonal",
+    "office fédéral", "portail public", "guichet", "annuaire officiel",
+    # Immobilier
+    "immobilier", "agence immobilière", "real estate", "location", "achat",
+    "vendre", "louer", "appartement", "maison", "bien immobilier",
+    # Grandes plateformes/Annuaires
+    "wikipedia", "encyclopédie", "comparis", "homegate", "immoscout",
+    "immoweb", "anibis", "pages jaunes", "annuaire téléphonique",
+    # Médias (sites de presse)
+    "rts", "24heures", "lematin", "20min", "letemps", "tdg", "blick", "srf", "nzz",
+    # Grandes entreprises et leurs filiales
+    "coop", "migros", "denner", "manor", "globus", "galaxus", "digitec", "amazon",
+    "mcdonald", "burger king", "kfc", "starbucks", "zara", "h&m", "ikea",
+    "media markt", "fnac", "swisscom", "sunrise", "ubs", "credit suisse",
+    "accor", "expedia", "tripadvisor", "airbnb", "trivago",
+    "filiale", "succursale", "branch", "subsidiary", "franchise"
+)
+
+# Chaque liste compilée une fois en une seule regex : un parcours de texte par résultat
+_SITE_EXCLU_RE = compiler_alternatives(_DOMAINES_EXCLUS, _PATTERNS_URL_EXCLUS)
+_RESULTAT_EXCLU_RE = compiler_alternatives(_MOTS_EXCLUS)
+
+# Préfixes communs des titres de sites gouvernementaux
+_PREFIXES_A_ENLEVER = (
+    "Ville de ", "Commune de ", "Administration de ", "Office de ",
+    "Service de ", "Canton de "
+)
+
+# Numéros français, dans l'ordre de priorité
+_TELEPHONE_RES = (
+    re.compile(r'0[1-9](?:[.\s-]?[0-9]{2}){4}'),  # Format standard
+    re.compile(r'\+33[1-9](?:[.\s-]?[0-9]{2}){4}'),  # Format international
+)
+
+
 class SerperClient:
     """Client pour interroger l'API Serper.dev."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_requetes_simultanees: int = 8,
+                 requetes_par_minute: Optional[float] = None, session: Optional[requests.Session] = None):
         """
         Initialise le client Serper.
         
         Args:
             api_key: Clé API Serper.dev
+            max_requetes_simultanees: Nombre maximum de requêtes Serper en parallèle (partagé entre workers)
+            requetes_par_minute: Quota de requêtes par minute (None = pas de limite)
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.api_key = api_key
+        self.session = session or creer_session()
+        self._semaphore = threading.BoundedSemaphore(max_requetes_simultanees)
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
         self.base_url = "https://google.serper.dev"
+        activer_reprises(self.session, self.base_url)
         self.headers = {
             "X-API-KEY": api_key,
             "Content-Type": "application/json"
@@ -117,15 +210,18 @@ class SerperClient:
                 "location": location_precise  # Localisation précise pour améliorer la pertinence
             }
             
-            logger.debug(f"Payload Serper: gl={gl_code}, hl={hl_code}, location={location_precise}, query={query[:100]}...")
+            logger.debug("Payload Serper: gl=%s, hl=%s, location=%s, query=%.100s...", gl_code, hl_code, location_precise, query)
             
             try:
-                response = requests.post(
-                    f"{self.base_url}/search",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=(10, 30)  # (connect timeout, read timeout)
-                )
+                if self._limiteur:
+                    self._limiteur.attendre()
+                with self._semaphore:
+                    response = self.session.post(
+                        f"{self.base_url}/search",
+                        headers=self.headers,
+                        json=payload,
+                        timeout=(10, 30)  # (connect timeout, read timeout)
+                    )
                 response.raise_for_status()
                 data = response.json()
             except requests.exceptions.Timeout as e:
@@ -147,7 +243,7 @@ class SerperClient:
                     
                     # Filtrer les sites gouvernementaux, publics et non pertinents
                     if self._est_site_non_pertinent(link):
-                        logger.debug(f"Site exclu (gouvernemental/public): {link}")
+                        logger.debug("Site exclu (gouvernemental/public): %s", link)
                         continue
                     
                     titre = result.get("title", "")
@@ -157,12 +253,12 @@ class SerperClient:
                     if pays:
                         pays_resultat = self._detecter_pays_resultat(titre, description, link)
                         if pays_resultat and not self._pays_correspond(pays, pays_resultat):
-                            logger.debug(f"❌ Résultat Serper exclu (pays={pays_resultat} au lieu de {pays}): {titre}")
+                            logger.debug("❌ Résultat Serper exclu (pays=%s au lieu de %s): %s", pays_resultat, pays, titre)
                             continue
                     
                     # Filtrer aussi selon le titre et la description
                     if self._est_resultat_non_pertinent(titre, description):
-                        logger.debug(f"Résultat exclu (non PME privée): {titre}")
+                        logger.debug("Résultat exclu (non PME privée): %s", titre)
                         continue
                     
                     entreprise = {
@@ -200,54 +296,9 @@ class SerperClient:
         """
         if not url:
             return True  # Exclure si URL est None ou vide
-        url_lower = url.lower()
-        
-        # Domaines à exclure : gouvernementaux, grandes plateformes, immobilier, groupes/hôtels, etc.
-        domaines_exclus = [
-            # Gouvernemental/Public
-            ".gov", ".gouv", ".admin.ch", "ge.ch", "ville-", "commune-",
-            "administration", "canton", "service-public", "public-",
-            "/ville/", "/commune/", "/administration/", "portail-public",
-            # Grandes plateformes/Annuaires
-            "wikipedia.org", "facebook.com", "linkedin.com", "twitter.com",
-            "instagram.com", "youtube.com", "google.com", "maps.google",
-            "pagesjaunes", "annuaire", "annuaire-", "comparis.ch",
-            # Médias (sites de presse)
-            "rts.ch", "24heures.ch", "lematin.ch", "20min.ch", "letemps.ch",
-            "tdg.ch", "blick.ch", "srf.ch", "nzz.ch",
-            # Immobilier
-            "homegate.ch", "immoscout24.ch", "immoweb.ch", "anibis.ch",
-            "immobilier", "real-estate", "agence-immobiliere",
-            # Grandes chaînes/Groups (hôtels, restaurants de chaînes)
-            "accor.com", "booking.com", "expedia.com", "tripadvisor.com",
-            "airbnb.com", "trivago.com", "agoda.com", "hotels.com",
-            "groupon.com", "uber.com", "deliveroo.com", "justeat.com",
-            # E-commerce/Marketplaces
-            "amazon", "galaxus.ch", "digitec.ch", "ricardo.ch",
-            "coop.ch", "migros.ch",
-            # Voyages
-            "booking.com", "trivago", "tripadvisor",
-            # Autres grandes bases de données
-            "ch.ch", "search.ch", "local.ch"
-        ]
-        
-        for domaine in domaines_exclus:
-            if domaine in url_lower:
-                return True
-        
-        # Exclure les URLs avec des patterns suspects (sites génériques de groupes)
-        # Exemples: restaurants.accor.com, hotels.booking.com, etc.
-        patterns_exclus = [
-            "/restaurant-", "/hotel-", "/shop-", "/store-", "/location-",
-            "/fr/restaurant", "/fr/hotel", "/en/restaurant", "/en/hotel",
-            "/restaurant/", "/hotel/", "/location/",
-            ".accor.", ".booking.", ".expedia.", ".tripadvisor.",
-            "restaurants.", "hotels.", "shops."
-        ]
-        if any(pattern in url_lower for pattern in patterns_exclus):
-            return True
-            
-            return False
+        
+        # Domaines et patterns d'URL exclus (voir _SITE_EXCLU_RE)
+        return bool(_SITE_EXCLU_RE.search(url.lower()))
     
     def _est_resultat_non_pertinent(self, titre: str, description: str) -> bool:
         """
@@ -264,34 +315,8 @@ class SerperClient:
         description_safe = description or ""
         texte_complet = (titre_safe + " " + description_safe).lower()
         
-        # Mots-clés qui indiquent un site non pertinent (gouvernemental, grande entreprise, immobilier)
-        mots_exclus = [
-            # Gouvernemental/Public
-            "ville de", "commune de", "administration", "canton", "canton de",
-            "service public", "gouvernement", "municipalité", "mairie",
-            "préfecture", "département", "région", "office cantonal",
-            "office fédéral", "portail public", "guichet", "annuaire officiel",
-            # Immobilier
-            "immobilier", "agence immobilière", "real estate", "location", "achat",
-            "vendre", "louer", "appartement", "maison", "bien immobilier",
-            # Grandes plateformes/Annuaires
-            "wikipedia", "encyclopédie", "comparis", "homegate", "immoscout",
-            "immoweb", "anibis", "pages jaunes", "annuaire téléphonique",
-            # Médias (sites de presse)
-            "rts", "24heures", "lematin", "20min", "letemps", "tdg", "blick", "srf", "nzz",
-            # Grandes entreprises et leurs filiales
-            "coop", "migros", "denner", "manor", "globus", "galaxus", "digitec", "amazon",
-            "mcdonald", "burger king", "kfc", "starbucks", "zara", "h&m", "ikea",
-            "media markt", "fnac", "swisscom", "sunrise", "ubs", "credit suisse",
-            "accor", "expedia", "tripadvisor", "airbnb", "trivago",
-            "filiale", "succursale", "branch", "subsidiary", "franchise"
-        ]
-        
-        for mot in mots_exclus:
-            if mot in texte_complet:
-                return True
-        
-        return False
+        # Mots-clés qui indiquent un site non pertinent (voir _RESULTAT_EXCLU_RE)
+        return bool(_RESULTAT_EXCLU_RE.search(texte_complet))
     
     def _extraire_nom_entreprise(self, titre: str) -> str:
         """
@@ -307,12 +332,7 @@ class SerperClient:
         nom = titre.split(" - ")[0].split(" | ")[0].strip()
         
         # Nettoyer les préfixes communs de sites gouvernementaux
-        prefixes_a_enlever = [
-            "Ville de ", "Commune de ", "Administration de ", "Office de ",
-            "Service de ", "Canton de "
-        ]
-        
-        for prefix in prefixes_a_enlever:
+        for prefix in _PREFIXES_A_ENLEVER:
             if nom.startswith(prefix):
                 nom = nom[len(prefix):].strip()
         
@@ -328,16 +348,8 @@ class SerperClient:
         Returns:
             Numéro de téléphone trouvé ou None
         """
-        import re
-        
-        # Patterns pour numéros français
-        patterns = [
-            r'0[1-9](?:[.\s-]?[0-9]{2}){4}',  # Format standard
-            r'\+33[1-9](?:[.\s-]?[0-9]{2}){4}',  # Format international
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, texte)
+        for telephone_re in _TELEPHONE_RES:
+            match = telephone_re.search(texte)
             if match:
                 return match.group(0).replace(".", "").replace(" ", "").replace("-", "")
         
@@ -366,12 +378,15 @@ class SerperClient:
                 "num": 10
             }
             
-            response = requests.post(
-                f"{self.base_url}/search",
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            if self._limiteur:
+                self._limiteur.attendre()
+            with self._semaphore:
+                response = self.session.post(
+                    f"{self.base_url}/search",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=30
+                )
             
             response.raise_for_status()
             data = response.json()
@@ -7,20 +7,24 @@ import requests
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 
+from http_session import creer_session
+
 logger = logging.getLogger(__name__)
 
 
 class TechnologyDetector:
     """Détecte les technologies utilisées sur un site web."""
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, session: Optional[requests.Session] = None):
         """
         Initialise le détecteur de technologies.
         
         Args:
             timeout: Timeout pour les requêtes HTTP en secondes
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.timeout = timeout
+        self.session = session or creer_session()
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
@@ -120,7 +124,7 @@ class TechnologyDetector:
                 site_web = f"https://{site_web}"
             
             # Récupérer le contenu HTML
-            response = requests.get(site_web, timeout=self.timeout, headers=self.headers, allow_redirects=True)
+            response = self.session.get(site_web, timeout=self.timeout, headers=self.headers, allow_redirects=True)
             response.raise_for_status()
             
             html_content = response.text
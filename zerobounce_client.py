@@ -3,7 +3,12 @@ Module client pour l'API ZeroBounce - Vérification d'emails.
 """
 import requests
 import logging
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, List, Tuple
+
+from http_session import activer_reprises, creer_session
+from rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -11,15 +16,23 @@ logger = logging.getLogger(__name__)
 class ZeroBounceClient:
     """Client pour interroger l'API ZeroBounce."""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, requetes_par_minute: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
         """
         Initialise le client ZeroBounce.
         
         Args:
             api_key: Clé API ZeroBounce
+            requetes_par_minute: Quota de requêtes par minute (None = pas de limite)
+            session: Session HTTP partagée (une session dédiée est créée si absente)
         """
         self.api_key = api_key
+        self.session = session or creer_session()
+        self._limiteur = RateLimiter(requetes_par_minute) if requetes_par_minute else None
         self.base_url = "https://api.zerobounce.net/v2"
+        self.bulk_url = "https://bulkapi.zerobounce.net/v2"
+        # Pas de nouvelles tentatives sur l'API groupée : chaque envoi d'un lot est facturé
+        activer_reprises(self.session, self.base_url)
     
     def verifier_email(self, email: str, ip_address: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -49,7 +62,9 @@ class ZeroBounceClient:
             if ip_address:
                 params["ip_address"] = ip_address
             
-            response = requests.get(url, params=params, timeout=30)
+            if self._limiteur:
+                self._limiteur.attendre()
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -95,6 +110,60 @@ class ZeroBounceClient:
                 "credits_remaining": 0
             }
     
+    def verifier_emails(self, emails: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Vérifie plusieurs emails en une seule requête (endpoint validatebatch, 100 emails max par appel).
+        
+        Args:
+            emails: Emails à vérifier
+        
+        Returns:
+            Dictionnaire email -> résultat (même format que verifier_email, sans les crédits
+            que l'endpoint batch ne renvoie pas). Les emails en erreur ont le statut "unknown".
+        """
+        resultats = {}
+        for debut in range(0, len(emails), 100):
+            lot = emails[debut:debut + 100]
+            try:
+                if self._limiteur:
+                    self._limiteur.attendre()
+                response = self.session.post(
+                    f"{self.bulk_url}/validatebatch",
+                    json={
+                        "api_key": self.api_key,
+                        "email_batch": [{"email_address": email} for email in lot]
+                    },
+                    timeout=60
+                )
+                response.raise_for_status()
+                data = response.json()
+                
+                for item in data.get("email_batch") or []:
+                    email = item.get("address", "")
+                    resultats[email.lower()] = {
+                        "status": item.get("status", "unknown"),
+                        "sub_status": item.get("sub_status", ""),
+                        "account": item.get("account", ""),
+                        "domain": item.get("domain", ""),
+                        "did_you_mean": item.get("did_you_mean"),
+                        "result": item.get("status", "unknown"),
+                        "credits_remaining": 0,
+                        "credits_used": 0
+                    }
+                
+                if data.get("errors"):
+                    logger.warning(f"Erreurs ZeroBounce (batch): {data['errors']}")
+                logger.info(f"{len(lot)} emails vérifiés en une requête ZeroBounce")
+                
+            except Exception as e:
+                logger.error(f"Erreur lors de la vérification ZeroBounce groupée ({len(lot)} emails): {e}")
+        
+        # Les emails absents de la réponse restent "unknown" (comme en cas d'erreur unitaire)
+        return {
+            email: resultats.get(email.lower()) or {"status": "unknown", "error": "absent de la réponse batch", "credits_remaining": 0}
+            for email in emails
+        }
+    
     def est_email_valide(self, email: str, ip_address: Optional[str] = None) -> bool:
         """
         Vérifie si un email est valide (méthode simplifiée).
@@ -127,7 +196,9 @@ class ZeroBounceClient:
                 "api_key": self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            if self._limiteur:
+                self._limiteur.attendre()
+            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -144,3 +215,71 @@ class ZeroBounceClient:
             logger.error(f"Erreur lors de la récupération des crédits ZeroBounce: {e}")
             return 0
 
+
+class VerificationEmailsGroupee:
+    """
+    Regroupe les vérifications d'emails demandées simultanément par plusieurs workers.
+    
+    Le premier demandeur envoie sa requête immédiatement ; les emails demandés pendant
+    qu'une requête est en cours s'accumulent et partent ensemble dans la suivante
+    (aucune attente ajoutée quand un seul worker vérifie un email).
+    """
+    
+    def __init__(self, client: ZeroBounceClient, taille_max: int = 100):
+        """
+        Initialise le regroupement.
+        
+        Args:
+            client: Client ZeroBounce utilisé pour les requêtes
+            taille_max: Nombre maximum d'emails par requête groupée
+        """
+        self.client = client
+        self.taille_max = taille_max
+        self._en_attente: List[Tuple[str, Future]] = []
+        self._envoi_en_cours = False
+        self._verrou = threading.Lock()
+    
+    def verifier_email(self, email: str) -> Dict[str, Any]:
+        """
+        Vérifie un email en le regroupant avec les demandes concurrentes.
+        
+        Args:
+            email: Email à vérifier
+        
+        Returns:
+            Résultat au format de ZeroBounceClient.verifier_email
+        """
+        future = Future()
+        with self._verrou:
+            self._en_attente.append((email, future))
+            # Si une requête est déjà en cours, son émetteur enverra aussi cet email
+            emetteur = not self._envoi_en_cours
+            self._envoi_en_cours = True
+        
+        if emetteur:
+            # Envoyer les lots tant que des demandes arrivent pendant les requêtes
+            while True:
+                with self._verrou:
+                    lot = self._en_attente[:self.taille_max]
+                    del self._en_attente[:self.taille_max]
+                    if not lot:
+                        self._envoi_en_cours = False
+                        break
+                self._envoyer(lot)
+        
+        return future.result()
+    
+    def _envoyer(self, lot: List[Tuple[str, Future]]):
+        """Vérifie un lot et transmet à chaque demandeur son résultat."""
+        try:
+            if len(lot) == 1:
+                # Un email seul passe par l'endpoint unitaire (qui renvoie aussi les crédits restants)
+                resultats = {lot[0][0]: self.client.verifier_email(lot[0][0])}
+            else:
+                resultats = self.client.verifier_emails(list(dict.fromkeys(email for email, _ in lot)))
+        except Exception as e:
+            logger.error(f"Erreur lors de l'envoi du lot ZeroBounce: {e}")
+            resultats = {}
+        
+        for email, future in lot:
+            future.set_result(resultats.get(email) or {"status": "unknown", "error": "lot non vérifié", "credits_remaining": 0})